@@ -6,15 +6,147 @@ A grammar is suitable for Recursive Descent if:
 2. It is LL(1) or can be made LL(1) through backtracking
 """
 
-from collections import defaultdict, deque
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
+from collections import OrderedDict, defaultdict, deque
+import functools
+import hashlib
+import io
+import logging
+import re
+import string
+import sys
+from itertools import takewhile
 from grammar import grammar
 
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# A quoted terminal runs to the closing quote (or end of line); anything else
+# is a run of characters up to whitespace or a quote
+_TOKEN_RE = re.compile(r"'[^']*'?|[^\s']+")
+
+# One grammar line: either "lhs → rhs" (anything after a second → is
+# ignored) or a continuation "| rhs" (up to the next |); surrounding blanks
+# are trimmed and lines matching neither are skipped
+_LINE_RE = re.compile(
+    r"^[^\S\n]*(?:"
+    r"([^→\n]*?)[^\S\n]*→[^\S\n]*([^→\n]*?)[^\S\n]*(?:→[^\n]*)?"
+    r"|[^→|\n]*\|[^\S\n]*([^|\n]*?)[^\S\n]*(?:\|[^\n]*)?"
+    r")$", re.M)
+
+# Every ε-production shares this one tuple, so it can be tested by identity
+EPSILON = (sys.intern('ε'),)
+
+# Workbook bytes of recently analyzed grammars, keyed by a hash of the
+# grammar text; the oldest entry is dropped past _XLSX_CACHE_SIZE
+_XLSX_CACHE = OrderedDict()
+_XLSX_CACHE_SIZE = 16
+
+# Excel shows at most 409 pt of a row, i.e. 27 lines at 15 pt each, so
+# longer code blocks are split over several rows
+_CODE_CELL_LINES = 27
+
+# Helper functions shared by every generated parser; $$ is a literal $
+_HELPER_TEMPLATE = string.Template("""# Global variables
+lookahead = None
+tokens = []
+index = 0
+
+def match(expected):
+    \"\"\"Match expected terminal and advance\"\"\"
+    global lookahead, index
+    if lookahead == expected:
+        index += 1
+        if index < len(tokens):
+            lookahead = tokens[index]
+        else:
+            lookahead = '$$'
+    else:
+        error(f'Expected {expected}, got {lookahead}')
+
+def error(msg):
+    \"\"\"Report parsing error\"\"\"
+    raise Exception(f'Parse error: {msg}')
+
+def parse(input_tokens):
+    \"\"\"Main parsing function\"\"\"
+    global lookahead, tokens, index
+    tokens = input_tokens + ['$$']
+    index = 0
+    lookahead = tokens[0]
+    parse_${start}()
+    if lookahead != '$$':
+        error('Unexpected tokens after parsing')
+""")
+
+
+def _excel_styles():
+    """Create the fonts, fills and alignments shared by all analysis sheets"""
+    from openpyxl.styles import Font, PatternFill, Alignment
+    
+    def solid(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+    
+    return {
+        'title': Font(bold=True, size=16),
+        'heading': Font(bold=True, size=14),
+        'heading_green': Font(bold=True, size=14, color="008000"),
+        'heading_red': Font(bold=True, size=14, color="FF0000"),
+        'heading_orange': Font(bold=True, size=14, color="FFA500"),
+        'subheading': Font(bold=True, size=12),
+        'subheading_red': Font(bold=True, size=12, color="FF0000"),
+        'subheading_orange': Font(bold=True, size=12, color="FFA500"),
+        'header': Font(bold=True, size=12, color="FFFFFF"),
+        'header_small': Font(bold=True, size=11, color="FFFFFF"),
+        'bold': Font(bold=True),
+        'bold_green': Font(bold=True, color="008000"),
+        'bold_red': Font(bold=True, color="FF0000"),
+        'bold_orange': Font(bold=True, color="FFA500"),
+        'white_bold': Font(bold=True, color="FFFFFF"),
+        'italic': Font(italic=True),
+        'green': Font(size=12, color="008000"),
+        'red': Font(color="FF0000"),
+        'fill_blue': solid("4472C4"),
+        'fill_red': solid("FF0000"),
+        'fill_red_light': solid("FFE6E6"),
+        'fill_orange': solid("FFA500"),
+        'fill_orange_light': solid("FFF4E6"),
+        'fill_gold': solid("FFC000"),
+        'fill_green': solid("70AD47"),
+        'fill_sky': solid("5B9BD5"),
+        'fill_conflict': solid("FF6B6B"),
+        'fill_entry': solid("E8F5E9"),
+        'wrap': Alignment(wrap_text=True, vertical='top'),
+    }
+
+
+def _styled_cell(ws, value, font=None, fill=None, alignment=None):
+    """Create a write-only cell carrying the given styles"""
+    from openpyxl.cell import WriteOnlyCell
+    
+    cell = WriteOnlyCell(ws, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
 
 class RecursiveDescentAnalyzer:
+    # Excel style palette, built on the first generate_excel call. openpyxl
+    # style objects are immutable, so one palette serves every workbook.
+    _styles_cache = None
+    
+    @classmethod
+    def _init_styles(cls):
+        """Return the shared Excel style palette, creating it on first use"""
+        if cls._styles_cache is None:
+            cls._styles_cache = _excel_styles()
+        return cls._styles_cache
+    
     def __init__(self, grammar_text):
+        self.grammar_text = grammar_text
         self.grammar = {}
         self.terminals = set()
         self.non_terminals = set()
@@ -22,31 +154,51 @@ class RecursiveDescentAnalyzer:
         
         self.first = defaultdict(set)
         self.follow = defaultdict(set)
+        
+        # FIRST/FOLLOW are computed as int bitsets over term_id and decoded
+        # into self.first/self.follow once they are final
+        self.term_id = {}
+        self.first_bits = defaultdict(int)
+        self.follow_bits = defaultdict(int)
+        self.nullable = set()
         self.parsing_table = defaultdict(dict)
+        self.production_first = {}
+        self._conflict_keys = frozenset()
+        self._parser_code_cache = {}
+        
+        # (left recursion, left factoring, conflicts), fixed once the
+        # parsing table is built
+        self._flags = None
         
         # Recursive Descent specific checks
         self.left_recursive_nts = []
+        self.left_recursive_nts_set = set()
         self.direct_left_recursion = []
         self.indirect_left_recursion = []
         self.left_factoring_needed = []
         self.conflicts = []
         
+        # Set when analyze() stopped early; generate_excel finishes the job
+        self.analysis_pending = False
+        self.analysis_complete = False
+        
+        # FIRST of a symbol string only depends on the FIRST sets, so the
+        # same suffixes seen by FOLLOW, the parsing table and the generated
+        # code are computed once per analysis
+        self._first_of_tuple = functools.lru_cache(maxsize=None)(self._compute_first_of_tuple)
+        
         self.parse_grammar(grammar_text)
         
     def parse_grammar(self, grammar_text):
         """Parse the grammar from text format"""
-        lines = grammar_text.strip().split('\n')
         current_lhs = None
+        seen_symbols = set()
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            if '→' in line:
-                parts = line.split('→')
-                lhs = parts[0].strip()
-                rhs = parts[1].strip()
+        for m in _LINE_RE.finditer(grammar_text):
+            lhs, rhs = m.group(1, 2)
+            
+            if rhs is not None:
+                lhs = sys.intern(lhs)
                 current_lhs = lhs
                 self.non_terminals.add(lhs)
                 
@@ -55,52 +207,52 @@ class RecursiveDescentAnalyzer:
                 
                 if lhs not in self.grammar:
                     self.grammar[lhs] = []
-                self.grammar[lhs].append(self.parse_production(rhs))
+                production = self.parse_production(rhs)
+                self.grammar[lhs].append(production)
+                seen_symbols.update(production)
                 
-            elif '|' in line:
-                rhs = line.split('|')[1].strip()
-                if current_lhs:
-                    self.grammar[current_lhs].append(self.parse_production(rhs))
-        
-        # Extract terminals
-        for lhs, productions in self.grammar.items():
-            for prod in productions:
-                for symbol in prod:
-                    if symbol != 'ε' and symbol not in self.non_terminals:
-                        self.terminals.add(symbol)
-        
-        self.terminals.add('$')
+            elif current_lhs:
+                production = self.parse_production(m.group(3))
+                self.grammar[current_lhs].append(production)
+                seen_symbols.update(production)
+        
+        # Extract terminals: every symbol that never appears on a left-hand side
+        self.terminals = (seen_symbols - self.non_terminals - {'ε'}) | {'$'}
+        
+        # The symbol sets are final from here on; sort them once for reports
+        self._sorted_nts = sorted(self.non_terminals)
+        self._sorted_ts = sorted(self.terminals)
+        
+        self.term_id = {'ε': 0}
+        for t in self._sorted_ts:
+            self.term_id[t] = len(self.term_id)
+        self._term_names = list(self.term_id)
+    
+    def iter_terminals(self, bits):
+        """Yield the names of the terminals set in a bitset, in id order"""
+        names = self._term_names
+        while bits:
+            low = bits & -bits
+            yield names[low.bit_length() - 1]
+            bits ^= low
+    
+    def decode_terminals(self, bits):
+        """Turn a terminal bitset back into a set of terminal names"""
+        return set(self.iter_terminals(bits))
     
     def parse_production(self, rhs):
         """Parse a production right-hand side into symbols"""
         if rhs == 'ε' or rhs == 'epsilon':
-            return ['ε']
-        
-        symbols = []
-        i = 0
-        while i < len(rhs):
-            if rhs[i] == "'":
-                j = i + 1
-                while j < len(rhs) and rhs[j] != "'":
-                    j += 1
-                symbols.append(rhs[i:j+1])
-                i = j + 1
-            elif rhs[i].isspace():
-                i += 1
-            else:
-                j = i
-                while j < len(rhs) and not rhs[j].isspace() and rhs[j] != "'":
-                    j += 1
-                symbol = rhs[i:j]
-                if symbol:
-                    symbols.append(symbol)
-                i = j
-        
-        return symbols if symbols else ['ε']
+            return EPSILON
+        
+        # Interned, so the many set and dict lookups keyed by symbol mostly
+        # resolve on identity
+        symbols = [sys.intern(s) for s in _TOKEN_RE.findall(rhs)]
+        return symbols if symbols else EPSILON
     
     def check_direct_left_recursion(self):
         """Check for direct left recursion: A → A α"""
-        print("\n=== CHECKING DIRECT LEFT RECURSION ===\n")
+        logger.info("\n=== CHECKING DIRECT LEFT RECURSION ===\n")
         
         for A in self.non_terminals:
             for production in self.grammar.get(A, []):
@@ -110,74 +262,120 @@ class RecursiveDescentAnalyzer:
                         'production': f"{A} → {' '.join(production)}",
                         'type': 'Direct'
                     })
-                    if A not in self.left_recursive_nts:
+                    if A not in self.left_recursive_nts_set:
+                        self.left_recursive_nts_set.add(A)
                         self.left_recursive_nts.append(A)
         
         if self.direct_left_recursion:
-            print(f"⚠️  Found {len(self.direct_left_recursion)} direct left recursion(s):")
+            logger.info(f"⚠️  Found {len(self.direct_left_recursion)} direct left recursion(s):")
             for dlr in self.direct_left_recursion:
-                print(f"  - {dlr['production']}")
+                logger.info(f"  - {dlr['production']}")
         else:
-            print("✓ No direct left recursion found")
+            logger.info("✓ No direct left recursion found")
     
     def check_indirect_left_recursion(self):
         """Check for indirect left recursion using graph traversal"""
-        print("\n=== CHECKING INDIRECT LEFT RECURSION ===\n")
+        logger.info("\n=== CHECKING INDIRECT LEFT RECURSION ===\n")
+        
+        nts = self.non_terminals
+        grammar = self.grammar
         
         # Build derivation graph
         derives_to = defaultdict(set)
-        for A in self.non_terminals:
-            for production in self.grammar.get(A, []):
-                if production and production != ['ε'] and production[0] in self.non_terminals:
+        for A in nts:
+            for production in grammar.get(A, []):
+                if production and production is not EPSILON and production[0] in nts:
                     derives_to[A].add(production[0])
         
-        # Check for cycles using DFS
-        def has_cycle(node, visited, rec_stack, path):
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
+        # Find strongly connected components with an iterative Tarjan's
+        # algorithm; a component is left-recursive when it holds a cycle
+        index_of = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        
+        for root in self._sorted_nts:
+            if root in index_of:
+                continue
+            
+            index_of[root] = lowlink[root] = len(index_of)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(sorted(derives_to.get(root, set()))))]
             
-            for neighbor in derives_to.get(node, set()):
-                if neighbor not in visited:
-                    if has_cycle(neighbor, visited, rec_stack, path):
-                        return True
-                elif neighbor in rec_stack:
-                    # Found a cycle
-                    cycle_start = path.index(neighbor)
-                    cycle = path[cycle_start:] + [neighbor]
+            while work:
+                node, neighbors = work[-1]
+                
+                for neighbor in neighbors:
+                    if neighbor not in index_of:
+                        index_of[neighbor] = lowlink[neighbor] = len(index_of)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(sorted(derives_to.get(neighbor, set())))))
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[neighbor])
+                else:
+                    # All neighbors done: pass lowlink up and emit a component
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
                     
-                    # Check if this is left recursion (not just any cycle)
-                    if cycle[0] == cycle[-1]:
-                        cycle_str = ' → '.join(cycle)
-                        self.indirect_left_recursion.append({
-                            'cycle': cycle,
-                            'description': cycle_str,
-                            'type': 'Indirect'
-                        })
-                        for nt in cycle[:-1]:
-                            if nt not in self.left_recursive_nts:
-                                self.left_recursive_nts.append(nt)
-                    return True
+                    if lowlink[node] == index_of[node]:
+                        members = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            members.add(member)
+                            if member == node:
+                                break
+                        components.append(members)
+        
+        def cycle_through(start, members):
+            """Shortest derivation cycle from start back to itself within members"""
+            parent = {}
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                for neighbor in sorted(derives_to.get(node, set())):
+                    if neighbor == start:
+                        path = [node]
+                        while path[-1] != start:
+                            path.append(parent[path[-1]])
+                        return path[::-1] + [start]
+                    if neighbor in members and neighbor not in parent:
+                        parent[neighbor] = node
+                        queue.append(neighbor)
+            return None
+        
+        for members in sorted(components, key=min):
+            start = min(members)
+            if len(members) == 1 and start not in derives_to.get(start, set()):
+                continue
             
-            path.pop()
-            rec_stack.remove(node)
-            return False
-        
-        visited = set()
-        for node in self.non_terminals:
-            if node not in visited:
-                has_cycle(node, visited, set(), [])
+            cycle = cycle_through(start, members)
+            self.indirect_left_recursion.append({
+                'cycle': cycle,
+                'description': ' → '.join(cycle),
+                'type': 'Indirect'
+            })
+            for nt in sorted(members):
+                if nt not in self.left_recursive_nts_set:
+                    self.left_recursive_nts_set.add(nt)
+                    self.left_recursive_nts.append(nt)
         
         if self.indirect_left_recursion:
-            print(f"⚠️  Found {len(self.indirect_left_recursion)} indirect left recursion(s):")
+            logger.info(f"⚠️  Found {len(self.indirect_left_recursion)} indirect left recursion(s):")
             for ilr in self.indirect_left_recursion:
-                print(f"  - {ilr['description']}")
+                logger.info(f"  - {ilr['description']}")
         else:
-            print("✓ No indirect left recursion found")
+            logger.info("✓ No indirect left recursion found")
     
     def check_left_factoring(self):
         """Check if left factoring is needed"""
-        print("\n=== CHECKING LEFT FACTORING ===\n")
+        logger.info("\n=== CHECKING LEFT FACTORING ===\n")
         
         for A in self.non_terminals:
             productions = self.grammar.get(A, [])
@@ -185,7 +383,7 @@ class RecursiveDescentAnalyzer:
             # Group productions by first symbol
             first_symbols = defaultdict(list)
             for prod in productions:
-                if prod != ['ε']:
+                if prod is not EPSILON:
                     first_sym = prod[0]
                     first_symbols[first_sym].append(prod)
             
@@ -203,183 +401,266 @@ class RecursiveDescentAnalyzer:
                         })
         
         if self.left_factoring_needed:
-            print(f"⚠️  Left factoring needed for {len(self.left_factoring_needed)} case(s):")
+            logger.info(f"⚠️  Left factoring needed for {len(self.left_factoring_needed)} case(s):")
             for lf in self.left_factoring_needed:
-                print(f"  - {lf['non_terminal']}: common prefix = {' '.join(lf['common_prefix'])}")
+                logger.info(f"  - {lf['non_terminal']}: common prefix = {' '.join(lf['common_prefix'])}")
         else:
-            print("✓ No left factoring needed")
+            logger.info("✓ No left factoring needed")
     
     def find_common_prefix(self, productions):
         """Find the longest common prefix among productions"""
         if not productions:
             return []
         
-        min_len = min(len(p) for p in productions)
-        common = []
-        
-        for i in range(min_len):
-            symbol = productions[0][i]
-            if all(p[i] == symbol for p in productions):
-                common.append(symbol)
-            else:
-                break
+        # zip stops at the shortest production; takewhile stops at the
+        # first column where the productions disagree
+        columns = zip(*productions)
+        return [column[0] for column in takewhile(lambda c: len(set(c)) == 1, columns)]
+    
+    def compute_nullable(self):
+        """Compute the set of symbols that can derive ε"""
+        nullable = self.nullable = {'ε'}
+        grammar = self.grammar
         
-        return common
+        changed = True
+        while changed:
+            changed = False
+            for A in self.non_terminals:
+                if A in nullable:
+                    continue
+                for production in grammar.get(A, []):
+                    if all(symbol in nullable for symbol in production):
+                        nullable.add(A)
+                        changed = True
+                        break
     
     def compute_first(self):
         """Compute FIRST sets for all symbols"""
-        print("\n=== COMPUTING FIRST SETS ===\n")
+        logger.info("\n=== COMPUTING FIRST SETS ===\n")
+        
+        self._first_of_tuple.cache_clear()
+        
+        eps = 1 << self.term_id['ε']
+        first = self.first_bits
+        nts = self.non_terminals
+        grammar = self.grammar
+        nullable = self.nullable
         
         # Initialize FIRST for terminals
         for t in self.terminals:
-            self.first[t].add(t)
+            first[t] = 1 << self.term_id[t]
+        
+        first['ε'] = eps
+        
+        # Reduce each non-terminal's productions to what can start them:
+        # terminals fold straight into its initial bits, non-terminals become
+        # the edges the fixed point propagates along. ε is left out here and
+        # added from the nullable set at the end.
+        sources = {}
+        dependents = defaultdict(set)
+        for A in nts:
+            bits = 0
+            starts = set()
+            for production in grammar[A]:
+                for symbol in production:
+                    if symbol in nts:
+                        starts.add(symbol)
+                        dependents[symbol].add(A)
+                    else:
+                        bits |= first.get(symbol, 0) & ~eps
+                    if symbol not in nullable:
+                        break
+            first[A] = bits
+            sources[A] = tuple(starts)
+        
+        # Compute FIRST for non-terminals, revisiting A only when a set it
+        # depends on has grown
+        worklist = deque(self._sorted_nts)
+        queued = set(worklist)
+        while worklist:
+            A = worklist.popleft()
+            queued.discard(A)
+            bits = first[A]
+            
+            for B in sources[A]:
+                bits |= first[B]
+            
+            if bits != first[A]:
+                first[A] = bits
+                for B in dependents[A] - queued:
+                    worklist.append(B)
+                    queued.add(B)
         
-        self.first['ε'].add('ε')
+        for A in nts & nullable:
+            first[A] |= eps
         
-        # Compute FIRST for non-terminals
-        changed = True
-        while changed:
-            changed = False
-            for A in self.non_terminals:
-                for production in self.grammar.get(A, []):
-                    before = len(self.first[A])
-                    
-                    if production == ['ε']:
-                        self.first[A].add('ε')
-                        if len(self.first[A]) > before:
-                            changed = True
-                        continue
-                    
-                    all_nullable = True
-                    for symbol in production:
-                        self.first[A].update(self.first.get(symbol, set()) - {'ε'})
-                        
-                        if 'ε' not in self.first.get(symbol, set()):
-                            all_nullable = False
-                            break
-                    
-                    if all_nullable:
-                        self.first[A].add('ε')
-                    
-                    if len(self.first[A]) > before:
-                        changed = True
+        for symbol, bits in first.items():
+            self.first[symbol] = self.decode_terminals(bits)
         
-        for A in sorted(self.non_terminals):
-            print(f"FIRST({A}) = {{{', '.join(sorted(self.first[A]))}}}")
+        for A in self._sorted_nts:
+            logger.info(f"FIRST({A}) = {{{', '.join(sorted(self.first[A]))}}}")
     
     def compute_first_of_string(self, symbols):
         """Compute FIRST of a string of symbols"""
-        result = set()
+        return frozenset(self.decode_terminals(self._first_of_tuple(tuple(symbols))))
+    
+    def _compute_first_of_tuple(self, symbols):
+        """Compute FIRST bitset of a tuple of symbols (cached by _first_of_tuple)"""
+        eps = 1 << self.term_id['ε']
         
-        if not symbols or symbols == ['ε']:
-            result.add('ε')
-            return result
+        if not symbols or symbols is EPSILON:
+            return eps
         
+        first = self.first_bits
+        nullable = self.nullable
+        
+        result = 0
         all_nullable = True
         for symbol in symbols:
-            result.update(self.first.get(symbol, set()) - {'ε'})
+            result |= first.get(symbol, 0) & ~eps
             
-            if 'ε' not in self.first.get(symbol, set()):
+            if symbol not in nullable:
                 all_nullable = False
                 break
         
         if all_nullable:
-            result.add('ε')
+            result |= eps
         
         return result
     
     def compute_follow(self):
         """Compute FOLLOW sets for all non-terminals"""
-        print("\n=== COMPUTING FOLLOW SETS ===\n")
+        logger.info("\n=== COMPUTING FOLLOW SETS ===\n")
+        
+        # FIRST sets are final by now; drop anything cached while they grew
+        self._first_of_tuple.cache_clear()
+        
+        eps = 1 << self.term_id['ε']
+        follow = self.follow_bits
+        follow[self.start_symbol] |= 1 << self.term_id['$']
+        nts = self.non_terminals
+        grammar = self.grammar
+        first_of_tuple = self._first_of_tuple
+        
+        # FIRST(β) of every suffix after a non-terminal is fixed, so it goes
+        # straight into FOLLOW; only a nullable β makes FOLLOW(B) depend on
+        # FOLLOW(A), and those edges are all the fixed point has to follow
+        inherits_to = defaultdict(set)
+        for A in nts:
+            for production in grammar[A]:
+                if production is EPSILON:
+                    continue
+                
+                for i, B in enumerate(production):
+                    if B in nts:
+                        first_beta = first_of_tuple(tuple(production[i+1:]))
+                        follow[B] |= first_beta & ~eps
+                        if first_beta & eps and A != B:
+                            inherits_to[A].add(B)
+        
+        # Push each grown FOLLOW set along its edges until nothing changes
+        worklist = deque(self._sorted_nts)
+        queued = set(worklist)
+        while worklist:
+            A = worklist.popleft()
+            queued.discard(A)
+            bits = follow[A]
+            
+            for B in inherits_to[A]:
+                if follow[B] | bits != follow[B]:
+                    follow[B] |= bits
+                    if B not in queued:
+                        worklist.append(B)
+                        queued.add(B)
         
-        self.follow[self.start_symbol].add('$')
+        for A in self.non_terminals:
+            self.follow[A] = self.decode_terminals(follow[A])
         
-        changed = True
-        while changed:
-            changed = False
-            
-            for A in self.non_terminals:
-                for production in self.grammar.get(A, []):
-                    if production == ['ε']:
-                        continue
-                    
-                    for i, B in enumerate(production):
-                        if B in self.non_terminals:
-                            before = len(self.follow[B])
-                            
-                            beta = production[i+1:]
-                            first_beta = self.compute_first_of_string(beta)
-                            self.follow[B].update(first_beta - {'ε'})
-                            
-                            if not beta or 'ε' in first_beta:
-                                self.follow[B].update(self.follow[A])
-                            
-                            if len(self.follow[B]) > before:
-                                changed = True
-        
-        for A in sorted(self.non_terminals):
-            print(f"FOLLOW({A}) = {{{', '.join(sorted(self.follow[A]))}}}")
+        for A in self._sorted_nts:
+            logger.info(f"FOLLOW({A}) = {{{', '.join(sorted(self.follow[A]))}}}")
     
     def build_parsing_table(self):
         """Build LL(1) predictive parsing table"""
-        print("\n=== BUILDING PARSING TABLE ===\n")
+        logger.info("\n=== BUILDING PARSING TABLE ===\n")
+        
+        grammar = self.grammar
+        table = self.parsing_table
+        conflicts = self.conflicts
+        first_of_tuple = self._first_of_tuple
+        iter_terminals = self.iter_terminals
+        eps = 1 << self.term_id['ε']
+        
+        def add_entry(A, terminal, prod_str, conflict_type):
+            row = table[A]
+            if terminal in row:
+                existing = row[terminal]
+                conflicts.append({
+                    'non_terminal': A,
+                    'terminal': terminal,
+                    'production1': existing,
+                    'production2': prod_str,
+                    'type': conflict_type
+                })
+                row[terminal] = f"{existing} / {prod_str}"
+            else:
+                row[terminal] = prod_str
         
-        for A in self.non_terminals:
-            for production in self.grammar.get(A, []):
+        # Lookaheads come straight from the FIRST/FOLLOW bitsets; every bit
+        # other than ε is a terminal
+        for A in self._sorted_nts:
+            for i, production in enumerate(grammar[A]):
                 prod_str = f"{A} → {' '.join(production)}"
-                first_alpha = self.compute_first_of_string(production)
+                first_alpha = first_of_tuple(tuple(production))
+                self.production_first[(A, i)] = frozenset(iter_terminals(first_alpha))
                 
-                for terminal in first_alpha - {'ε'}:
-                    if terminal in self.terminals:
-                        if terminal in self.parsing_table[A]:
-                            existing = self.parsing_table[A][terminal]
-                            self.conflicts.append({
-                                'non_terminal': A,
-                                'terminal': terminal,
-                                'production1': existing,
-                                'production2': prod_str,
-                                'type': 'FIRST-FIRST conflict'
-                            })
-                            self.parsing_table[A][terminal] = f"{existing} / {prod_str}"
-                        else:
-                            self.parsing_table[A][terminal] = prod_str
+                for terminal in iter_terminals(first_alpha & ~eps):
+                    add_entry(A, terminal, prod_str, 'FIRST-FIRST conflict')
                 
-                if 'ε' in first_alpha:
-                    for terminal in self.follow[A]:
-                        if terminal in self.terminals:
-                            if terminal in self.parsing_table[A]:
-                                existing = self.parsing_table[A][terminal]
-                                self.conflicts.append({
-                                    'non_terminal': A,
-                                    'terminal': terminal,
-                                    'production1': existing,
-                                    'production2': prod_str,
-                                    'type': 'FIRST-FOLLOW conflict'
-                                })
-                                self.parsing_table[A][terminal] = f"{existing} / {prod_str}"
-                            else:
-                                self.parsing_table[A][terminal] = prod_str
-        
-        print(f"Parsing table entries: {sum(len(row) for row in self.parsing_table.values())}")
+                if first_alpha & eps:
+                    for terminal in iter_terminals(self.follow_bits[A]):
+                        add_entry(A, terminal, prod_str, 'FIRST-FOLLOW conflict')
+        
+        self._conflict_keys = frozenset((c['non_terminal'], c['terminal']) for c in conflicts)
+        self._flags = (bool(self.left_recursive_nts), bool(self.left_factoring_needed), bool(self.conflicts))
+        
+        logger.info(f"Parsing table entries: {sum(len(row) for row in self.parsing_table.values())}")
         
         if self.conflicts:
-            print(f"\n⚠️  Found {len(self.conflicts)} parsing conflict(s)!")
+            logger.info(f"\n⚠️  Found {len(self.conflicts)} parsing conflict(s)!")
         else:
-            print("\n✓ No parsing conflicts found")
+            logger.info("\n✓ No parsing conflicts found")
+    
+    def analysis_flags(self):
+        """(has left recursion, needs left factoring, has conflicts)"""
+        if self._flags is not None:
+            return self._flags
+        # The parsing table has not been built yet (fast-fail analysis)
+        return (bool(self.left_recursive_nts), bool(self.left_factoring_needed), bool(self.conflicts))
     
     def is_suitable_for_recursive_descent(self):
         """Check if grammar is suitable for Recursive Descent parsing"""
         # Main criteria: no left recursion
-        return len(self.left_recursive_nts) == 0
+        return not self.analysis_flags()[0]
     
     def is_backtrack_free(self):
         """Check if grammar can be parsed without backtracking (i.e., is LL(1))"""
-        return (len(self.left_recursive_nts) == 0 and 
-                len(self.left_factoring_needed) == 0 and 
-                len(self.conflicts) == 0)
+        return not any(self.analysis_flags())
+    
+    def production_first_set(self, A, i):
+        """FIRST of the i-th production of A, as recorded by build_parsing_table"""
+        key = (A, i)
+        if key not in self.production_first:
+            self.production_first[key] = self.compute_first_of_string(self.grammar[A][i])
+        return self.production_first[key]
     
     def generate_parser_code(self, A):
         """Generate sample recursive descent parser code for a non-terminal"""
+        if A not in self._parser_code_cache:
+            self._parser_code_cache[A] = self._build_parser_code(A)
+        return self._parser_code_cache[A]
+    
+    def _build_parser_code(self, A):
+        """Build the parser code returned by generate_parser_code"""
         code_lines = []
         code_lines.append(f"def parse_{A}():")
         code_lines.append(f"    \"\"\"Parse non-terminal {A}\"\"\"")
@@ -388,7 +669,7 @@ class RecursiveDescentAnalyzer:
         
         if len(productions) == 1:
             prod = productions[0]
-            if prod == ['ε']:
+            if prod is EPSILON:
                 code_lines.append(f"    # ε production - do nothing")
                 code_lines.append(f"    pass")
             else:
@@ -399,19 +680,18 @@ class RecursiveDescentAnalyzer:
                         code_lines.append(f"    match('{symbol}')")
         else:
             # Multiple productions - need to look at current token
-            code_lines.append(f"    if lookahead in {list(self.first.get(A, set()) - {'ε'})}:")
+            first_A = sorted(self.first.get(A, set()) - {'ε'})
+            code_lines.append(f"    if lookahead in {first_A}:")
+            
+            first_sets = [self.production_first_set(A, i) for i in range(len(productions))]
             
             for i, prod in enumerate(productions):
-                first_set = self.compute_first_of_string(prod)
-                
-                if i == 0:
-                    code_lines.append(f"        # {A} → {' '.join(prod)}")
-                    code_lines.append(f"        if lookahead in {list(first_set - {'ε'})}:")
-                else:
-                    code_lines.append(f"        # {A} → {' '.join(prod)}")
-                    code_lines.append(f"        elif lookahead in {list(first_set - {'ε'})}:")
+                first_prod = sorted(first_sets[i] - {'ε'})
+                keyword = "if" if i == 0 else "elif"
+                code_lines.append(f"        # {A} → {' '.join(prod)}")
+                code_lines.append(f"        {keyword} lookahead in {first_prod}:")
                 
-                if prod == ['ε']:
+                if prod is EPSILON:
                     code_lines.append(f"            pass  # ε production")
                 else:
                     for symbol in prod:
@@ -421,8 +701,9 @@ class RecursiveDescentAnalyzer:
                             code_lines.append(f"            match('{symbol}')")
             
             # Check FOLLOW set for epsilon productions
-            if any('ε' in self.compute_first_of_string(p) for p in productions):
-                code_lines.append(f"        elif lookahead in {list(self.follow.get(A, set()))}:")
+            if any('ε' in first_set for first_set in first_sets):
+                follow_A = sorted(self.follow.get(A, set()))
+                code_lines.append(f"        elif lookahead in {follow_A}:")
                 code_lines.append(f"            pass  # ε production via FOLLOW")
             
             code_lines.append(f"        else:")
@@ -430,472 +711,370 @@ class RecursiveDescentAnalyzer:
         
         return '\n'.join(code_lines)
     
+    def complete_analysis(self):
+        """Run every check that follows the direct left recursion check"""
+        self.check_indirect_left_recursion()
+        self.check_left_factoring()
+        self.compute_nullable()
+        self.compute_first()
+        self.compute_follow()
+        self.build_parsing_table()
+        self._parser_code_cache.clear()
+        self.analysis_pending = False
+        self.analysis_complete = True
+    
     def generate_excel(self, filename='RD_analysis.xlsx'):
         """Generate Excel file with complete analysis"""
-        wb = openpyxl.Workbook()
-        wb.remove(wb.active)
-        
-        self.create_result_sheet(wb)
-        self.create_grammar_sheet(wb)
-        self.create_left_recursion_sheet(wb)
-        self.create_left_factoring_sheet(wb)
-        self.create_first_sheet(wb)
-        self.create_follow_sheet(wb)
-        self.create_parsing_table_sheet(wb)
-        self.create_parser_code_sheet(wb)
-        self.create_recommendations_sheet(wb)
-        
-        wb.save(filename)
-        print(f"\n✅ Excel file created: {filename}")
+        key = hashlib.blake2b(self.grammar_text.encode('utf-8')).hexdigest()
+        data = _XLSX_CACHE.get(key)
+        
+        if data is not None:
+            # Same grammar as a recent run: reuse its workbook as-is
+            _XLSX_CACHE.move_to_end(key)
+        else:
+            if self.analysis_pending:
+                self.complete_analysis()
+            
+            data = self._build_xlsx_bytes()
+            
+            # Only a full analysis describes the grammar completely
+            if self.analysis_complete:
+                _XLSX_CACHE[key] = data
+                if len(_XLSX_CACHE) > _XLSX_CACHE_SIZE:
+                    _XLSX_CACHE.popitem(last=False)
+        
+        with open(filename, 'wb') as f:
+            f.write(data)
+        logger.info(f"\n✅ Excel file created: {filename}")
+    
+    def _build_xlsx_bytes(self):
+        """Build the analysis workbook and return it as .xlsx bytes"""
+        # openpyxl is only needed for Excel output, so analysis-only use of
+        # this module never pays for importing it
+        import openpyxl
+        from openpyxl.worksheet.cell_range import MultiCellRange
+        
+        # Write-only workbooks stream each row to disk as it is appended
+        # instead of keeping every cell in memory until save
+        wb = openpyxl.Workbook(write_only=True)
+        
+        # Every sheet draws from the shared style palette
+        self._styles = self._init_styles()
+        self._pending_merges = defaultdict(list)
+        
+        self.create_result_sheet(wb, self._styles)
+        self.create_grammar_sheet(wb, self._styles)
+        self.create_left_recursion_sheet(wb, self._styles)
+        self.create_left_factoring_sheet(wb, self._styles)
+        self.create_first_sheet(wb, self._styles)
+        self.create_follow_sheet(wb, self._styles)
+        self.create_parsing_table_sheet(wb, self._styles)
+        self.create_parser_code_sheet(wb, self._styles)
+        self.create_recommendations_sheet(wb, self._styles)
+        
+        # Register each sheet's merges in one go rather than through
+        # MultiCellRange.add, which rescans every existing range per call
+        for ws, ranges in self._pending_merges.items():
+            ws.merged_cells = MultiCellRange(ranges)
+        self._pending_merges.clear()
+        
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
     
-    def create_result_sheet(self, wb):
+    def _append_merged(self, ws, row, value, last_column, font=None, fill=None):
+        """Append a single styled cell as row and queue a merge across columns 1..last_column"""
+        from openpyxl.worksheet.cell_range import CellRange
+        
+        ws.append([_styled_cell(ws, value, font=font, fill=fill)])
+        self._pending_merges[ws].append(CellRange(min_col=1, min_row=row, max_col=last_column, max_row=row))
+    
+    def create_result_sheet(self, wb, styles):
         """Create result sheet"""
         ws = wb.create_sheet("Result", 0)
         
-        ws['A1'] = "Recursive Descent Parser Analysis Result"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws.merge_cells('A1:D1')
-        
-        ws['A3'] = "Suitable for Recursive Descent?"
-        ws['A3'].font = Font(bold=True, size=14)
+        ws.column_dimensions['A'].width = 30
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 20
+        ws.column_dimensions['D'].width = 20
         
         is_suitable = self.is_suitable_for_recursive_descent()
-        ws['B3'] = "YES ✓" if is_suitable else "NO ✗"
-        ws['B3'].font = Font(bold=True, size=14, color="008000" if is_suitable else "FF0000")
-        
-        ws['A5'] = "Backtrack-Free (LL(1))?"
-        ws['A5'].font = Font(bold=True, size=14)
-        
         is_backtrack_free = self.is_backtrack_free()
-        ws['B5'] = "YES ✓" if is_backtrack_free else "NO ✗"
-        ws['B5'].font = Font(bold=True, size=14, color="008000" if is_backtrack_free else "FFA500")
-        
-        ws['A7'] = "Number of Non-Terminals:"
-        ws['A7'].font = Font(bold=True)
-        ws['B7'] = len(self.non_terminals)
-        
-        ws['A8'] = "Number of Terminals:"
-        ws['A8'].font = Font(bold=True)
-        ws['B8'] = len(self.terminals) - 1
-        
-        ws['A9'] = "Direct Left Recursions:"
-        ws['A9'].font = Font(bold=True)
-        ws['B9'] = len(self.direct_left_recursion)
-        if len(self.direct_left_recursion) > 0:
-            ws['B9'].font = Font(color="FF0000", bold=True)
-        
-        ws['A10'] = "Indirect Left Recursions:"
-        ws['A10'].font = Font(bold=True)
-        ws['B10'] = len(self.indirect_left_recursion)
-        if len(self.indirect_left_recursion) > 0:
-            ws['B10'].font = Font(color="FF0000", bold=True)
-        
-        ws['A11'] = "Left Factoring Needed:"
-        ws['A11'].font = Font(bold=True)
-        ws['B11'] = len(self.left_factoring_needed)
-        if len(self.left_factoring_needed) > 0:
-            ws['B11'].font = Font(color="FFA500", bold=True)
-        
-        ws['A12'] = "Parsing Conflicts:"
-        ws['A12'].font = Font(bold=True)
-        ws['B12'] = len(self.conflicts)
-        if len(self.conflicts) > 0:
-            ws['B12'].font = Font(color="FFA500", bold=True)
+        
+        self._append_merged(ws, 1, "Recursive Descent Parser Analysis Result", 4, font=styles['title'])
+        ws.append([])
+        
+        ws.append([
+            _styled_cell(ws, "Suitable for Recursive Descent?", font=styles['heading']),
+            _styled_cell(ws, "YES ✓" if is_suitable else "NO ✗",
+                         font=styles['heading_green' if is_suitable else 'heading_red'])
+        ])
+        ws.append([])
+        
+        ws.append([
+            _styled_cell(ws, "Backtrack-Free (LL(1))?", font=styles['heading']),
+            _styled_cell(ws, "YES ✓" if is_backtrack_free else "NO ✗",
+                         font=styles['heading_green' if is_backtrack_free else 'heading_orange'])
+        ])
+        ws.append([])
+        
+        ws.append([_styled_cell(ws, "Number of Non-Terminals:", font=styles['bold']), len(self.non_terminals)])
+        ws.append([_styled_cell(ws, "Number of Terminals:", font=styles['bold']), len(self.terminals) - 1])
+        
+        counts = [
+            ("Direct Left Recursions:", len(self.direct_left_recursion), styles['bold_red']),
+            ("Indirect Left Recursions:", len(self.indirect_left_recursion), styles['bold_red']),
+            ("Left Factoring Needed:", len(self.left_factoring_needed), styles['bold_orange']),
+            ("Parsing Conflicts:", len(self.conflicts), styles['bold_orange']),
+        ]
+        for label, count, font in counts:
+            ws.append([
+                _styled_cell(ws, label, font=styles['bold']),
+                _styled_cell(ws, count, font=font if count > 0 else None)
+            ])
+        ws.append([])
         
         # Summary
-        ws['A14'] = "Summary:"
-        ws['A14'].font = Font(bold=True, size=12)
-        ws.merge_cells('A14:D14')
+        self._append_merged(ws, 14, "Summary:", 4, font=styles['subheading'])
         
-        row = 15
         if is_backtrack_free:
-            ws[f'A{row}'] = "✓ Grammar is LL(1) - Perfect for backtrack-free Recursive Descent!"
-            ws[f'A{row}'].font = Font(bold=True, color="008000")
-            ws.merge_cells(f'A{row}:D{row}')
+            summary = [
+                ("✓ Grammar is LL(1) - Perfect for backtrack-free Recursive Descent!", styles['bold_green']),
+            ]
         elif is_suitable:
-            ws[f'A{row}'] = "⚠ Grammar can use Recursive Descent but may need backtracking"
-            ws[f'A{row}'].font = Font(bold=True, color="FFA500")
-            ws.merge_cells(f'A{row}:D{row}')
-            row += 1
-            ws[f'A{row}'] = "Consider left factoring to eliminate backtracking"
-            ws.merge_cells(f'A{row}:D{row}')
+            summary = [
+                ("⚠ Grammar can use Recursive Descent but may need backtracking", styles['bold_orange']),
+                ("Consider left factoring to eliminate backtracking", None),
+            ]
         else:
-            ws[f'A{row}'] = "✗ Grammar has left recursion - NOT suitable for Recursive Descent"
-            ws[f'A{row}'].font = Font(bold=True, color="FF0000")
-            ws.merge_cells(f'A{row}:D{row}')
-            row += 1
-            ws[f'A{row}'] = "Left recursion must be eliminated first!"
-            ws[f'A{row}'].font = Font(color="FF0000")
-            ws.merge_cells(f'A{row}:D{row}')
+            summary = [
+                ("✗ Grammar has left recursion - NOT suitable for Recursive Descent", styles['bold_red']),
+                ("Left recursion must be eliminated first!", styles['red']),
+            ]
         
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 20
+        row = 15
+        for text, font in summary:
+            self._append_merged(ws, row, text, 4, font=font)
+            row += 1
     
-    def create_grammar_sheet(self, wb):
+    def create_grammar_sheet(self, wb, styles):
         """Create grammar sheet"""
         ws = wb.create_sheet("Grammar")
         
-        ws['A1'] = "Production #"
-        ws['B1'] = "Non-Terminal"
-        ws['C1'] = "Production"
-        ws['D1'] = "Issues"
+        ws.column_dimensions['A'].width = 15
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 40
+        ws.column_dimensions['D'].width = 30
         
-        for cell in ['A1', 'B1', 'C1', 'D1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_blue'])
+                   for title in ("Production #", "Non-Terminal", "Production", "Issues")])
         
-        row = 2
         prod_num = 0
         
         for nt in sorted(self.grammar.keys()):
             for prod in self.grammar[nt]:
-                ws[f'A{row}'] = prod_num
-                ws[f'B{row}'] = nt
-                ws[f'C{row}'] = f"{nt} → {' '.join(prod)}"
-                
                 # Check for issues
-                issues = []
                 if prod and prod[0] == nt:
-                    issues.append("Direct Left Recursion")
-                    ws[f'D{row}'].fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-                    ws[f'D{row}'].font = Font(color="FFFFFF", bold=True)
-                
-                ws[f'D{row}'] = ', '.join(issues) if issues else 'OK'
+                    issues = _styled_cell(ws, "Direct Left Recursion", font=styles['white_bold'], fill=styles['fill_red'])
+                else:
+                    issues = 'OK'
                 
-                row += 1
+                ws.append([prod_num, nt, f"{nt} → {' '.join(prod)}", issues])
                 prod_num += 1
-        
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 40
-        ws.column_dimensions['D'].width = 30
     
-    def create_left_recursion_sheet(self, wb):
+    def create_left_recursion_sheet(self, wb, styles):
         """Create left recursion analysis sheet"""
         ws = wb.create_sheet("Left Recursion")
         
-        ws['A1'] = "Left Recursion Analysis"
-        ws['A1'].font = Font(bold=True, size=14)
-        ws.merge_cells('A1:D1')
-        
-        ws['A3'] = "Type"
-        ws['B3'] = "Non-Terminal"
-        ws['C3'] = "Production"
-        ws['D3'] = "Description"
-        
-        for cell in ['A3', 'B3', 'C3', 'D3']:
-            ws[cell].font = Font(bold=True, size=11)
-            ws[cell].fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=11, color="FFFFFF")
+        ws.column_dimensions['A'].width = 15
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 40
+        ws.column_dimensions['D'].width = 40
         
-        row = 4
+        self._append_merged(ws, 1, "Left Recursion Analysis", 4, font=styles['heading'])
+        ws.append([])
+        ws.append([_styled_cell(ws, title, font=styles['header_small'], fill=styles['fill_red'])
+                   for title in ("Type", "Non-Terminal", "Production", "Description")])
         
         if not self.direct_left_recursion and not self.indirect_left_recursion:
-            ws['A4'] = "✓ No left recursion found - Grammar is suitable for Recursive Descent!"
-            ws['A4'].font = Font(bold=True, color="008000")
-            ws.merge_cells('A4:D4')
+            self._append_merged(ws, 4, "✓ No left recursion found - Grammar is suitable for Recursive Descent!", 4,
+                                font=styles['bold_green'])
         else:
-            for dlr in self.direct_left_recursion:
-                ws[f'A{row}'] = "Direct"
-                ws[f'B{row}'] = dlr['non_terminal']
-                ws[f'C{row}'] = dlr['production']
-                ws[f'D{row}'] = "Production starts with same non-terminal"
-                
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                
-                row += 1
+            rows = [["Direct", dlr['non_terminal'], dlr['production'],
+                     "Production starts with same non-terminal"]
+                    for dlr in self.direct_left_recursion]
+            rows.extend(["Indirect", ilr['cycle'][0], ilr['description'],
+                         "Cycle in derivation graph"]
+                        for ilr in self.indirect_left_recursion)
             
-            for ilr in self.indirect_left_recursion:
-                ws[f'A{row}'] = "Indirect"
-                ws[f'B{row}'] = ilr['cycle'][0]
-                ws[f'C{row}'] = ilr['description']
-                ws[f'D{row}'] = "Cycle in derivation graph"
-                
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                
-                row += 1
-        
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 40
-        ws.column_dimensions['D'].width = 40
+            for values in rows:
+                ws.append([_styled_cell(ws, value, fill=styles['fill_red_light']) for value in values])
     
-    def create_left_factoring_sheet(self, wb):
+    def create_left_factoring_sheet(self, wb, styles):
         """Create left factoring analysis sheet"""
         ws = wb.create_sheet("Left Factoring")
         
-        ws['A1'] = "Left Factoring Analysis"
-        ws['A1'].font = Font(bold=True, size=14)
-        ws.merge_cells('A1:D1')
-        
-        ws['A3'] = "Non-Terminal"
-        ws['B3'] = "Common Prefix"
-        ws['C3'] = "Productions"
-        ws['D3'] = "Impact"
-        
-        for cell in ['A3', 'B3', 'C3', 'D3']:
-            ws[cell].font = Font(bold=True, size=11)
-            ws[cell].fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=11, color="FFFFFF")
+        ws.column_dimensions['A'].width = 20
+        ws.column_dimensions['B'].width = 25
+        ws.column_dimensions['C'].width = 40
+        ws.column_dimensions['D'].width = 30
         
-        row = 4
+        self._append_merged(ws, 1, "Left Factoring Analysis", 4, font=styles['heading'])
+        ws.append([])
+        ws.append([_styled_cell(ws, title, font=styles['header_small'], fill=styles['fill_orange'])
+                   for title in ("Non-Terminal", "Common Prefix", "Productions", "Impact")])
         
         if not self.left_factoring_needed:
-            ws['A4'] = "✓ No left factoring needed - Grammar is left-factored!"
-            ws['A4'].font = Font(bold=True, color="008000")
-            ws.merge_cells('A4:D4')
+            self._append_merged(ws, 4, "✓ No left factoring needed - Grammar is left-factored!", 4,
+                                font=styles['bold_green'])
         else:
+            row = 4
             for lf in self.left_factoring_needed:
-                ws[f'A{row}'] = lf['non_terminal']
-                ws[f'B{row}'] = ' '.join(lf['common_prefix'])
-                ws[f'C{row}'] = '\n'.join(lf['productions'])
-                ws[f'C{row}'].alignment = Alignment(wrap_text=True, vertical='top')
-                ws[f'D{row}'] = "May require backtracking"
-                
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFF4E6", end_color="FFF4E6", fill_type="solid")
-                
+                # Row heights must be known before the row is streamed out
                 ws.row_dimensions[row].height = 15 * len(lf['productions'])
+                ws.append([
+                    _styled_cell(ws, lf['non_terminal'], fill=styles['fill_orange_light']),
+                    _styled_cell(ws, ' '.join(lf['common_prefix']), fill=styles['fill_orange_light']),
+                    _styled_cell(ws, '\n'.join(lf['productions']), fill=styles['fill_orange_light'], alignment=styles['wrap']),
+                    _styled_cell(ws, "May require backtracking", fill=styles['fill_orange_light'])
+                ])
                 row += 1
-        
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['C'].width = 40
-        ws.column_dimensions['D'].width = 30
     
-    def create_first_sheet(self, wb):
+    def create_first_sheet(self, wb, styles):
         """Create FIRST sets sheet"""
         ws = wb.create_sheet("FIRST Sets")
         
-        ws['A1'] = "Symbol"
-        ws['B1'] = "FIRST Set"
-        ws['C1'] = "Used for Parsing Decisions"
-        
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
-        
-        row = 2
-        for A in sorted(self.non_terminals):
-            ws[f'A{row}'] = A
-            first_set = sorted(self.first.get(A, set()))
-            ws[f'B{row}'] = ', '.join(first_set)
-            
-            if 'ε' in self.first.get(A, set()):
-                ws[f'C{row}'] = "Uses FOLLOW set"
-            else:
-                ws[f'C{row}'] = "Direct lookahead"
-            
-            row += 1
-        
         ws.column_dimensions['A'].width = 20
         ws.column_dimensions['B'].width = 40
         ws.column_dimensions['C'].width = 30
+        
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_gold'])
+                   for title in ("Symbol", "FIRST Set", "Used for Parsing Decisions")])
+        
+        for A in self._sorted_nts:
+            first_set = self.first.get(A, set())
+            ws.append([A, ', '.join(sorted(first_set)),
+                       "Uses FOLLOW set" if 'ε' in first_set else "Direct lookahead"])
     
-    def create_follow_sheet(self, wb):
+    def create_follow_sheet(self, wb, styles):
         """Create FOLLOW sets sheet"""
         ws = wb.create_sheet("FOLLOW Sets")
         
-        ws['A1'] = "Non-Terminal"
-        ws['B1'] = "FOLLOW Set"
-        ws['C1'] = "Used for ε-productions"
-        
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
-        
-        row = 2
-        for A in sorted(self.non_terminals):
-            ws[f'A{row}'] = A
-            follow_set = sorted(self.follow.get(A, set()))
-            ws[f'B{row}'] = ', '.join(follow_set)
-            
-            has_epsilon = any('ε' in self.compute_first_of_string(prod) 
-                            for prod in self.grammar.get(A, []))
-            ws[f'C{row}'] = "Yes" if has_epsilon else "No"
-            
-            row += 1
-        
         ws.column_dimensions['A'].width = 20
         ws.column_dimensions['B'].width = 40
         ws.column_dimensions['C'].width = 30
+        
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_green'])
+                   for title in ("Non-Terminal", "FOLLOW Set", "Used for ε-productions")])
+        
+        for A in self._sorted_nts:
+            has_epsilon = any('ε' in self.production_first_set(A, i)
+                              for i in range(len(self.grammar.get(A, []))))
+            ws.append([A, ', '.join(sorted(self.follow.get(A, set()))),
+                       "Yes" if has_epsilon else "No"])
     
-    def create_parsing_table_sheet(self, wb):
+    def create_parsing_table_sheet(self, wb, styles):
         """Create parsing table sheet"""
+        from openpyxl.utils import get_column_letter
+        
         ws = wb.create_sheet("Parsing Table")
         
-        ws['A1'] = "Predictive Parsing Table"
-        ws['A1'].font = Font(bold=True, size=14)
-        ws.merge_cells('A1:' + get_column_letter(len(self.terminals) + 1) + '1')
+        terminals_sorted = self._sorted_ts
+        
+        # Column letters for the non-terminal column plus one per terminal
+        columns = [get_column_letter(i) for i in range(1, len(terminals_sorted) + 2)]
+        
+        ws.column_dimensions['A'].width = 20
+        for column in columns[1:]:
+            ws.column_dimensions[column].width = 30
+        
+        self._append_merged(ws, 1, "Predictive Parsing Table", len(columns), font=styles['heading'])
+        ws.append([])
         
         # Headers
-        ws['A3'] = "Non-Terminal"
-        ws['A3'].font = Font(bold=True, size=11)
-        ws['A3'].fill = PatternFill(start_color="5B9BD5", end_color="5B9BD5", fill_type="solid")
-        ws['A3'].font = Font(bold=True, size=11, color="FFFFFF")
-        
-        col_idx = 2
-        terminal_cols = {}
-        for terminal in sorted(self.terminals):
-            col_letter = get_column_letter(col_idx)
-            ws[f'{col_letter}3'] = terminal
-            ws[f'{col_letter}3'].font = Font(bold=True, size=11)
-            ws[f'{col_letter}3'].fill = PatternFill(start_color="5B9BD5", end_color="5B9BD5", fill_type="solid")
-            ws[f'{col_letter}3'].font = Font(bold=True, size=11, color="FFFFFF")
-            terminal_cols[terminal] = col_letter
-            col_idx += 1
-        
-        # Fill table
-        row = 4
-        for A in sorted(self.non_terminals):
-            ws[f'A{row}'] = A
-            ws[f'A{row}'].font = Font(bold=True)
+        ws.append([_styled_cell(ws, title, font=styles['header_small'], fill=styles['fill_sky'])
+                   for title in ["Non-Terminal"] + terminals_sorted])
+        
+        # Fill table from one flat (A, terminal) map; blank cells are left
+        # out of the row entirely
+        flat = {(A, t): entry for A, row in self.parsing_table.items() for t, entry in row.items()}
+        conflict_keys = self._conflict_keys
+        
+        for A in self._sorted_nts:
+            row_cells = [_styled_cell(ws, A, font=styles['bold'])]
             
-            for terminal in sorted(self.terminals):
-                col_letter = terminal_cols[terminal]
-                entry = self.parsing_table.get(A, {}).get(terminal, '')
-                ws[f'{col_letter}{row}'] = entry
+            for terminal in terminals_sorted:
+                entry = flat.get((A, terminal))
                 
                 # Highlight conflicts
-                if '/' in str(entry):
-                    ws[f'{col_letter}{row}'].fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")
-                    ws[f'{col_letter}{row}'].font = Font(color="FFFFFF", bold=True)
-                elif entry:
-                    ws[f'{col_letter}{row}'].fill = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
+                if entry is None:
+                    row_cells.append(None)
+                elif (A, terminal) in conflict_keys:
+                    row_cells.append(_styled_cell(ws, entry, font=styles['white_bold'], fill=styles['fill_conflict']))
+                else:
+                    row_cells.append(_styled_cell(ws, entry, fill=styles['fill_entry']))
             
-            row += 1
-        
-        ws.column_dimensions['A'].width = 20
-        for col_letter in terminal_cols.values():
-            ws.column_dimensions[col_letter].width = 30
+            ws.append(row_cells)
     
-    def create_parser_code_sheet(self, wb):
+    def create_parser_code_sheet(self, wb, styles):
         """Create parser code sheet"""
         ws = wb.create_sheet("Parser Code")
         
-        ws['A1'] = "Generated Recursive Descent Parser Code"
-        ws['A1'].font = Font(bold=True, size=14)
-        ws.merge_cells('A1:B1')
-        
-        ws['A3'] = "This is sample code for a Recursive Descent parser."
-        ws['A3'].font = Font(italic=True)
-        ws.merge_cells('A3:B3')
-        
-        ws['A4'] = "Note: Adjust according to your specific grammar and requirements."
-        ws['A4'].font = Font(italic=True)
-        ws.merge_cells('A4:B4')
-        
-        row = 6
+        ws.column_dimensions['A'].width = 120
+        ws.column_dimensions['B'].width = 20
         
-        # Header code
-        ws[f'A{row}'] = "# Recursive Descent Parser"
-        ws[f'A{row}'].font = Font(bold=True, size=12)
-        ws.merge_cells(f'A{row}:B{row}')
-        row += 1
+        self._append_merged(ws, 1, "Generated Recursive Descent Parser Code", 2, font=styles['heading'])
+        ws.append([])
         
-        ws[f'A{row}'] = ""
-        ws.merge_cells(f'A{row}:B{row}')
-        row += 1
+        ws.append([_styled_cell(ws, "This is sample code for a Recursive Descent parser.", font=styles['italic'])])
+        ws.append([_styled_cell(ws, "Note: Adjust according to your specific grammar and requirements.",
+                                font=styles['italic'])])
+        ws.append([])
         
         # Helper functions
-        helper_code = """# Global variables
-lookahead = None
-tokens = []
-index = 0
-
-def match(expected):
-    \"\"\"Match expected terminal and advance\"\"\"
-    global lookahead, index
-    if lookahead == expected:
-        index += 1
-        if index < len(tokens):
-            lookahead = tokens[index]
-        else:
-            lookahead = '$'
-    else:
-        error(f'Expected {expected}, got {lookahead}')
-
-def error(msg):
-    \"\"\"Report parsing error\"\"\"
-    raise Exception(f'Parse error: {msg}')
-
-def parse(input_tokens):
-    \"\"\"Main parsing function\"\"\"
-    global lookahead, tokens, index
-    tokens = input_tokens + ['$']
-    index = 0
-    lookahead = tokens[0]
-    parse_""" + (self.start_symbol if self.start_symbol else "S") + """()
-    if lookahead != '$':
-        error('Unexpected tokens after parsing')
-"""
-        
-        for line in helper_code.split('\n'):
-            ws[f'A{row}'] = line
-            ws.merge_cells(f'A{row}:B{row}')
-            row += 1
+        helper_code = _HELPER_TEMPLATE.substitute(start=self.start_symbol or "S")
         
-        ws[f'A{row}'] = ""
-        ws.merge_cells(f'A{row}:B{row}')
-        row += 1
+        # Header code, helper functions, then one parser per non-terminal.
+        # Each heading gets its own row and each code block wrapped cells of
+        # up to _CODE_CELL_LINES lines, instead of one merged row per line.
+        blocks = [("# Recursive Descent Parser", styles['subheading'], helper_code.rstrip('\n'))]
+        for A in self._sorted_nts:
+            blocks.append((f"# Parser for {A}", styles['bold'], self.generate_parser_code(A)))
         
-        # Generate parser functions for each non-terminal
-        for A in sorted(self.non_terminals):
-            ws[f'A{row}'] = f"# Parser for {A}"
-            ws[f'A{row}'].font = Font(bold=True)
-            ws.merge_cells(f'A{row}:B{row}')
+        row = 6
+        for heading, font, code in blocks:
+            ws.append([_styled_cell(ws, heading, font=font)])
             row += 1
             
-            parser_code = self.generate_parser_code(A)
-            for line in parser_code.split('\n'):
-                ws[f'A{row}'] = line
-                ws.merge_cells(f'A{row}:B{row}')
+            # Row heights must be known before the row is streamed out
+            lines = code.split('\n')
+            for start in range(0, len(lines), _CODE_CELL_LINES):
+                chunk = lines[start:start + _CODE_CELL_LINES]
+                ws.row_dimensions[row].height = 15 * len(chunk)
+                ws.append([_styled_cell(ws, '\n'.join(chunk), alignment=styles['wrap'])])
                 row += 1
-            
-            ws[f'A{row}'] = ""
-            ws.merge_cells(f'A{row}:B{row}')
-            row += 1
-        
-        ws.column_dimensions['A'].width = 80
-        ws.column_dimensions['B'].width = 20
     
-    def create_recommendations_sheet(self, wb):
+    def create_recommendations_sheet(self, wb, styles):
         """Create recommendations sheet"""
         ws = wb.create_sheet("Recommendations")
         
-        ws['A1'] = "Recommendations for Recursive Descent Parsing"
-        ws['A1'].font = Font(bold=True, size=14)
-        ws.merge_cells('A1:C1')
+        ws.column_dimensions['A'].width = 100
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 20
         
-        row = 3
+        # Each entry is (text, font, fill), where multi-line text becomes one
+        # wrapped cell; None marks a blank spacer row
+        lines = []
         
         # Check current status
-        has_left_recursion = len(self.left_recursive_nts) > 0
-        needs_left_factoring = len(self.left_factoring_needed) > 0
-        has_conflicts = len(self.conflicts) > 0
+        has_left_recursion, needs_left_factoring, has_conflicts = self.analysis_flags()
         
         if not has_left_recursion and not needs_left_factoring and not has_conflicts:
-            ws[f'A{row}'] = "✓ EXCELLENT!"
-            ws[f'A{row}'].font = Font(bold=True, size=14, color="008000")
-            ws.merge_cells(f'A{row}:C{row}')
-            row += 1
-            
-            ws[f'A{row}'] = "Your grammar is LL(1) and perfect for Recursive Descent parsing!"
-            ws[f'A{row}'].font = Font(size=12, color="008000")
-            ws.merge_cells(f'A{row}:C{row}')
-            row += 2
-            
-            ws[f'A{row}'] = "Implementation Steps:"
-            ws[f'A{row}'].font = Font(bold=True, size=12)
-            ws.merge_cells(f'A{row}:C{row}')
-            row += 1
+            lines.append(("✓ EXCELLENT!", styles['heading_green'], None))
+            lines.append(("Your grammar is LL(1) and perfect for Recursive Descent parsing!",
+                          styles['green'], None))
+            lines.append(None)
+            lines.append(("Implementation Steps:", styles['subheading'], None))
             
             steps = [
                 "1. Use the parsing table to guide parsing decisions",
@@ -904,35 +1083,19 @@ def parse(input_tokens):
                 "4. No backtracking needed - deterministic parsing"
             ]
             
-            for step in steps:
-                ws[f'A{row}'] = step
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
+            lines.append(('\n'.join(steps), None, None))
         else:
-            ws[f'A{row}'] = "⚠ GRAMMAR NEEDS TRANSFORMATION"
-            ws[f'A{row}'].font = Font(bold=True, size=14, color="FF0000" if has_left_recursion else "FFA500")
-            ws.merge_cells(f'A{row}:C{row}')
-            row += 2
+            lines.append(("⚠ GRAMMAR NEEDS TRANSFORMATION",
+                          styles['heading_red' if has_left_recursion else 'heading_orange'], None))
+            lines.append(None)
             
             if has_left_recursion:
-                ws[f'A{row}'] = "CRITICAL: Eliminate Left Recursion"
-                ws[f'A{row}'].font = Font(bold=True, size=12, color="FF0000")
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
-                
-                ws[f'A{row}'] = "Left recursion prevents Recursive Descent parsing from working."
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
-                
-                ws[f'A{row}'] = "Affected non-terminals: " + ', '.join(self.left_recursive_nts)
-                ws[f'A{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 2
-                
-                ws[f'A{row}'] = "Algorithm to eliminate left recursion:"
-                ws[f'A{row}'].font = Font(bold=True)
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
+                lines.append(("CRITICAL: Eliminate Left Recursion", styles['subheading_red'], None))
+                lines.append(("Left recursion prevents Recursive Descent parsing from working.", None, None))
+                lines.append(("Affected non-terminals: " + ', '.join(self.left_recursive_nts), None,
+                              styles['fill_red_light']))
+                lines.append(None)
+                lines.append(("Algorithm to eliminate left recursion:", styles['bold'], None))
                 
                 elimination_steps = [
                     "1. For direct left recursion A → Aα | β:",
@@ -944,32 +1107,16 @@ def parse(input_tokens):
                     "   c. Eliminate direct left recursion for Ai"
                 ]
                 
-                for step in elimination_steps:
-                    ws[f'A{row}'] = step
-                    ws.merge_cells(f'A{row}:C{row}')
-                    row += 1
-                
-                row += 1
+                lines.append(('\n'.join(elimination_steps), None, None))
+                lines.append(None)
             
             if needs_left_factoring:
-                ws[f'A{row}'] = "RECOMMENDED: Apply Left Factoring"
-                ws[f'A{row}'].font = Font(bold=True, size=12, color="FFA500")
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
-                
-                ws[f'A{row}'] = "Left factoring eliminates backtracking and makes the parser more efficient."
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
-                
-                ws[f'A{row}'] = f"Found {len(self.left_factoring_needed)} case(s) that need left factoring."
-                ws[f'A{row}'].fill = PatternFill(start_color="FFF4E6", end_color="FFF4E6", fill_type="solid")
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 2
-                
-                ws[f'A{row}'] = "Algorithm for left factoring:"
-                ws[f'A{row}'].font = Font(bold=True)
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
+                lines.append(("RECOMMENDED: Apply Left Factoring", styles['subheading_orange'], None))
+                lines.append(("Left factoring eliminates backtracking and makes the parser more efficient.", None, None))
+                lines.append((f"Found {len(self.left_factoring_needed)} case(s) that need left factoring.", None,
+                              styles['fill_orange_light']))
+                lines.append(None)
+                lines.append(("Algorithm for left factoring:", styles['bold'], None))
                 
                 factoring_steps = [
                     "1. Find productions with common prefix: A → αβ1 | αβ2 | ... | αβn | γ",
@@ -977,33 +1124,18 @@ def parse(input_tokens):
                     "3. Repeat until no common prefixes remain"
                 ]
                 
-                for step in factoring_steps:
-                    ws[f'A{row}'] = step
-                    ws.merge_cells(f'A{row}:C{row}')
-                    row += 1
-                
-                row += 1
+                lines.append(('\n'.join(factoring_steps), None, None))
+                lines.append(None)
             
             if has_conflicts:
-                ws[f'A{row}'] = "WARNING: Parsing Conflicts Detected"
-                ws[f'A{row}'].font = Font(bold=True, size=12, color="FF0000")
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
-                
-                ws[f'A{row}'] = f"Found {len(self.conflicts)} conflict(s) in the parsing table."
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 1
-                
-                ws[f'A{row}'] = "This indicates the grammar is not LL(1)."
-                ws[f'A{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                ws.merge_cells(f'A{row}:C{row}')
-                row += 2
+                lines.append(("WARNING: Parsing Conflicts Detected", styles['subheading_red'], None))
+                lines.append((f"Found {len(self.conflicts)} conflict(s) in the parsing table.", None, None))
+                lines.append(("This indicates the grammar is not LL(1).", None,
+                              styles['fill_red_light']))
+                lines.append(None)
         
-        row += 1
-        ws[f'A{row}'] = "Additional Resources:"
-        ws[f'A{row}'].font = Font(bold=True, size=12)
-        ws.merge_cells(f'A{row}:C{row}')
-        row += 1
+        lines.append(None)
+        lines.append(("Additional Resources:", styles['subheading'], None))
         
         resources = [
             "• Check the 'Left Recursion' sheet for specific problematic productions",
@@ -1012,55 +1144,71 @@ def parse(input_tokens):
             "• Refer to the 'Parser Code' sheet for implementation examples"
         ]
         
-        for resource in resources:
-            ws[f'A{row}'] = resource
-            ws.merge_cells(f'A{row}:C{row}')
-            row += 1
+        lines.append(('\n'.join(resources), None, None))
         
-        ws.column_dimensions['A'].width = 100
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 20
+        self._append_merged(ws, 1, "Recommendations for Recursive Descent Parsing", 3, font=styles['heading'])
+        ws.append([])
+        
+        # Column A is wide enough for every line, so only the title is merged
+        row = 3
+        for line in lines:
+            if line is None:
+                ws.append([])
+            elif '\n' in line[0]:
+                # A list of steps shares one wrapped cell; row heights must be
+                # known before the row is streamed out
+                text, font, fill = line
+                ws.row_dimensions[row].height = 15 * (text.count('\n') + 1)
+                ws.append([_styled_cell(ws, text, font=font, fill=fill, alignment=styles['wrap'])])
+            else:
+                text, font, fill = line
+                ws.append([_styled_cell(ws, text, font=font, fill=fill)])
+            row += 1
     
-    def analyze(self):
-        """Run complete analysis"""
-        print("=" * 70)
-        print("RECURSIVE DESCENT PARSER ANALYZER")
-        print("=" * 70)
+    def analyze(self, fast_fail=True):
+        """Run complete analysis
+        
+        With fast_fail, direct left recursion already rules the grammar out,
+        so the remaining checks are left for generate_excel to run.
+        """
+        logger.info("=" * 70)
+        logger.info("RECURSIVE DESCENT PARSER ANALYZER")
+        logger.info("=" * 70)
         
         self.check_direct_left_recursion()
-        self.check_indirect_left_recursion()
-        self.check_left_factoring()
-        self.compute_first()
-        self.compute_follow()
-        self.build_parsing_table()
         
-        print("\n" + "=" * 70)
-        print("ANALYSIS RESULT")
-        print("=" * 70)
+        if fast_fail and self.direct_left_recursion:
+            self.analysis_pending = True
+        else:
+            self.complete_analysis()
+        
+        logger.info("\n" + "=" * 70)
+        logger.info("ANALYSIS RESULT")
+        logger.info("=" * 70)
         
         is_suitable = self.is_suitable_for_recursive_descent()
         is_ll1 = self.is_backtrack_free()
         
         if is_ll1:
-            print("\n✅ Grammar is LL(1) - Perfect for Recursive Descent!")
-            print("   - No left recursion")
-            print("   - No left factoring needed")
-            print("   - No parsing conflicts")
-            print("   - Deterministic, backtrack-free parsing possible")
+            logger.info("\n✅ Grammar is LL(1) - Perfect for Recursive Descent!")
+            logger.info("   - No left recursion")
+            logger.info("   - No left factoring needed")
+            logger.info("   - No parsing conflicts")
+            logger.info("   - Deterministic, backtrack-free parsing possible")
         elif is_suitable:
-            print("\n⚠️  Grammar is suitable for Recursive Descent but NOT LL(1)")
-            print("   - No left recursion ✓")
+            logger.info("\n⚠️  Grammar is suitable for Recursive Descent but NOT LL(1)")
+            logger.info("   - No left recursion ✓")
             if self.left_factoring_needed:
-                print(f"   - Left factoring needed ({len(self.left_factoring_needed)} cases)")
+                logger.info(f"   - Left factoring needed ({len(self.left_factoring_needed)} cases)")
             if self.conflicts:
-                print(f"   - Parsing conflicts exist ({len(self.conflicts)} conflicts)")
-            print("   - May require backtracking")
+                logger.info(f"   - Parsing conflicts exist ({len(self.conflicts)} conflicts)")
+            logger.info("   - May require backtracking")
         else:
-            print("\n❌ Grammar is NOT suitable for Recursive Descent")
-            print(f"   - Has left recursion: {', '.join(self.left_recursive_nts)}")
-            print("   - Must eliminate left recursion first!")
+            logger.info("\n❌ Grammar is NOT suitable for Recursive Descent")
+            logger.info(f"   - Has left recursion: {', '.join(self.left_recursive_nts)}")
+            logger.info("   - Must eliminate left recursion first!")
         
-        print("\n" + "=" * 70)
+        logger.info("\n" + "=" * 70)
 
 
 def main():
@@ -1075,12 +1223,15 @@ def main():
     print("Enter a blank line when done:")
     print()
     
+    # Analysis progress is logged; show it on stdout like the rest of the CLI
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
     
     
     
     # Analyze grammar
     analyzer = RecursiveDescentAnalyzer(grammar)
-    analyzer.analyze()
+    analyzer.analyze(fast_fail=False)
     
     analyzer.generate_excel()
     
@@ -3,18 +3,75 @@ LALR(1) (Look-Ahead LR) Parser Analyzer
 Merges LR(1) states with same core to reduce state count
 """
 
+from array import array
 from collections import defaultdict, deque
+import re
+import sys
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 
+# A quoted terminal runs to the closing quote (or end of line); anything else
+# is a run of characters up to whitespace or a quote
+_TOKEN_RE = re.compile(r"'[^']*'?|[^\s']+")
+
+
+def _excel_styles():
+    """Create the fonts, fills and alignments shared by the analysis sheets"""
+    def solid(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+    
+    return {
+        'title': Font(bold=True, size=16),
+        'heading': Font(bold=True, size=14),
+        'heading_green': Font(bold=True, size=14, color="008000"),
+        'heading_red': Font(bold=True, size=14, color="FF0000"),
+        'subheading_green': Font(bold=True, size=12, color="008000"),
+        'subheading_red': Font(bold=True, size=12, color="FF0000"),
+        'header': Font(bold=True, size=12, color="FFFFFF"),
+        'header_small': Font(bold=True, size=11, color="FFFFFF"),
+        'bold_small': Font(bold=True, size=11),
+        'bold': Font(bold=True),
+        'white_bold': Font(bold=True, color="FFFFFF"),
+        'green': Font(color="008000"),
+        'black': Font(color="000000"),
+        'fill_blue': solid("4472C4"),
+        'fill_red': solid("FF0000"),
+        'fill_red_light': solid("FFE6E6"),
+        'fill_gold': solid("FFC000"),
+        'fill_yellow': solid("FFE699"),
+        'fill_sky': solid("5B9BD5"),
+        'fill_green_light': solid("E2EFDA"),
+        'fill_orange': solid("ED7D31"),
+        'center': Alignment(horizontal='center'),
+        'center_both': Alignment(horizontal='center', vertical='center'),
+        'wrap': Alignment(wrap_text=True, vertical='top'),
+    }
+
+
+def _styled_cell(ws, value, font=None, fill=None, alignment=None):
+    """Create a cell carrying the given styles, ready for ws.append"""
+    cell = WriteOnlyCell(ws, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
 class LR1Item:
     """Represents an LR(1) item: [A → α·β, a] where a is lookahead"""
+    __slots__ = ('lhs', 'rhs', 'dot_pos', 'lookahead', '_hash')
+    
     def __init__(self, lhs, rhs, dot_pos, lookahead):
         self.lhs = lhs
-        self.rhs = rhs
+        self.rhs = rhs  # Tuple of symbols
         self.dot_pos = dot_pos
         self.lookahead = lookahead  # Single terminal symbol
+        self._hash = hash((lhs, rhs, dot_pos, lookahead))
     
     def __eq__(self, other):
         return (self.lhs == other.lhs and 
@@ -23,15 +80,15 @@ class LR1Item:
                 self.lookahead == other.lookahead)
     
     def __hash__(self):
-        return hash((self.lhs, tuple(self.rhs), self.dot_pos, self.lookahead))
+        return self._hash
     
     def __repr__(self):
-        rhs_with_dot = self.rhs[:self.dot_pos] + ['·'] + self.rhs[self.dot_pos:]
+        rhs_with_dot = (*self.rhs[:self.dot_pos], '·', *self.rhs[self.dot_pos:])
         return f"[{self.lhs} → {' '.join(rhs_with_dot)}, {self.lookahead}]"
     
     def core(self):
         """Return the core (item without lookahead)"""
-        return (self.lhs, tuple(self.rhs), self.dot_pos)
+        return (self.lhs, self.rhs, self.dot_pos)
     
     def is_complete(self):
         return self.dot_pos >= len(self.rhs)
@@ -46,24 +103,33 @@ class LR1Item:
 
 
 class LALRState:
-    """Represents a state in LALR(1) automaton"""
+    """Represents a state in LALR(1) automaton
+    
+    items maps each core (lhs, rhs, dot_pos) to its lookaheads as a terminal
+    bitset, so the items sharing a core are stored once
+    """
+    __slots__ = ('id', 'items', 'merged_from')
+    
     def __init__(self, state_id, items, merged_from=None):
         self.id = state_id
-        self.items = frozenset(items)
-        self.merged_from = merged_from or []  # Track which LR(1) states were merged
+        self.items = items
+        # LR(1) state ids merged into this state; None unless there were several
+        self.merged_from = merged_from
     
     def core(self):
         """Return the core of this state (items without lookaheads)"""
-        return frozenset(item.core() for item in self.items)
+        return frozenset(self.items)
     
     def __eq__(self, other):
         return self.items == other.items
     
     def __hash__(self):
-        return hash(self.items)
+        return hash(frozenset(self.items.items()))
     
     def __repr__(self):
-        return f"State {self.id}:\n" + "\n".join(f"  {item}" for item in self.items)
+        return f"State {self.id}:\n" + "\n".join(
+            f"  [{lhs} → {' '.join((*rhs[:dot_pos], '·', *rhs[dot_pos:]))}, {bits:#b}]"
+            for (lhs, rhs, dot_pos), bits in self.items.items())
 
 
 class LALRAnalyzer:
@@ -73,13 +139,18 @@ class LALRAnalyzer:
         self.non_terminals = set()
         self.start_symbol = None
         self.augmented_start = None
+        self.initial_cores = {}
+        self.production_numbers = {}
         
         self.states = []
-        self.state_map = {}
         self.core_map = {}  # Map cores to merged states
         self.transitions = {}
         
         self.first = defaultdict(set)
+        # FIRST sets and lookaheads are int bitsets over term_bit; self.first
+        # holds the decoded sets for reports
+        self.term_bit = {}
+        self.first_bits = defaultdict(int)
         self.action_table = defaultdict(dict)
         self.goto_table = defaultdict(dict)
         self.conflicts = []
@@ -102,7 +173,7 @@ class LALRAnalyzer:
                 
             if '→' in line:
                 parts = line.split('→')
-                lhs = parts[0].strip()
+                lhs = sys.intern(parts[0].strip())
                 rhs = parts[1].strip()
                 current_lhs = lhs
                 self.non_terminals.add(lhs)
@@ -127,119 +198,163 @@ class LALRAnalyzer:
                         self.terminals.add(symbol)
         
         self.terminals.add('$')
+        
+        self._term_names = sorted(self.terminals)
+        self.term_bit = {t: 1 << i for i, t in enumerate(self._term_names)}
+    
+    def iter_terminals(self, bits):
+        """Yield the names of the terminals set in a bitset, in sorted order"""
+        names = self._term_names
+        while bits:
+            low = bits & -bits
+            yield names[low.bit_length() - 1]
+            bits ^= low
+    
+    def decode_terminals(self, bits):
+        """Turn a terminal bitset back into a set of terminal names"""
+        return set(self.iter_terminals(bits))
     
     def parse_production(self, rhs):
         """Parse a production right-hand side into symbols"""
-        symbols = []
-        i = 0
-        while i < len(rhs):
-            if rhs[i] == "'":
-                j = i + 1
-                while j < len(rhs) and rhs[j] != "'":
-                    j += 1
-                symbols.append(rhs[i:j+1])
-                i = j + 1
-            elif rhs[i].isspace():
-                i += 1
-            else:
-                j = i
-                while j < len(rhs) and not rhs[j].isspace() and rhs[j] != "'":
-                    j += 1
-                symbol = rhs[i:j]
-                if symbol:
-                    symbols.append(symbol)
-                i = j
-        
-        return symbols
+        return tuple(sys.intern(symbol) for symbol in _TOKEN_RE.findall(rhs))
     
     def augment_grammar(self):
         """Augment grammar with SBar → S"""
         self.augmented_start = self.start_symbol + "Bar"
-        self.grammar[self.augmented_start] = [[self.start_symbol]]
+        self.grammar[self.augmented_start] = [(self.start_symbol,)]
         self.non_terminals.add(self.augmented_start)
+        
+        # Closure adds the items [A → ·γ] for every production of A at once,
+        # so their cores are built here rather than on each expansion
+        self.initial_cores = {A: [(A, production, 0) for production in productions]
+                              for A, productions in self.grammar.items()}
+        
+        # Production numbers by (lhs, rhs), first occurrence wins. The
+        # augmented productions and the remaining ones (in sorted
+        # non-terminal order) are each counted from 0
+        self.production_numbers = {}
+        for prod_num, prod in enumerate(self.grammar[self.augmented_start]):
+            self.production_numbers.setdefault((self.augmented_start, prod), prod_num)
+        
+        prod_num = 0
+        for nt in sorted(self.grammar.keys()):
+            if nt == self.augmented_start:
+                continue
+            for prod in self.grammar[nt]:
+                self.production_numbers.setdefault((nt, prod), prod_num)
+                prod_num += 1
     
     def compute_first(self):
         """Compute FIRST sets for terminals and non-terminals"""
         print("\n=== COMPUTING FIRST SETS ===\n")
         
+        first_bits = self.first_bits
+        not_eps = ~self.term_bit.get('ε', 0)
+        
         # Initialize FIRST for terminals
+        for t, bit in self.term_bit.items():
+            first_bits[t] = bit
+        
+        # For simplicity, assume non-terminals are not nullable, so FIRST(A)
+        # only depends on the first symbol of each production of A
+        dependents = defaultdict(list)
+        for A in self.non_terminals:
+            for production in self.grammar.get(A, []):
+                if production:
+                    dependents[production[0]].append(A)
+        
+        # Compute FIRST for non-terminals; only those whose first symbols
+        # gained terminals are looked at again
+        work = deque(self.non_terminals)
+        queued = set(self.non_terminals)
+        while work:
+            A = work.popleft()
+            queued.discard(A)
+            
+            bits = first_bits[A]
+            for production in self.grammar.get(A, []):
+                if production:
+                    bits |= first_bits.get(production[0], 0) & not_eps
+            
+            if bits != first_bits[A]:
+                first_bits[A] = bits
+                for B in dependents[A]:
+                    if B not in queued:
+                        queued.add(B)
+                        work.append(B)
+        
         for t in self.terminals:
             self.first[t].add(t)
-        
-        # Compute FIRST for non-terminals
-        changed = True
-        while changed:
-            changed = False
-            for A in self.non_terminals:
-                for production in self.grammar.get(A, []):
-                    if production:
-                        for symbol in production:
-                            before = len(self.first[A])
-                            self.first[A].update(self.first.get(symbol, set()) - {'ε'})
-                            if len(self.first[A]) > before:
-                                changed = True
-                            # If symbol is terminal, stop
-                            if symbol in self.terminals:
-                                break
-                            # For simplicity, assume non-terminals are not nullable
-                            # So we stop after first symbol
-                            break
+        for A in self.non_terminals:
+            self.first[A] = self.decode_terminals(first_bits[A])
         
         for A in sorted(self.non_terminals):
             print(f"FIRST({A}) = {{{', '.join(sorted(self.first[A]))}}}")
     
+    def state_items(self, state):
+        """The LR(1) items of a state, one per core and lookahead"""
+        return [LR1Item(lhs, rhs, dot_pos, la)
+                for (lhs, rhs, dot_pos), bits in state.items.items()
+                for la in self.iter_terminals(bits)]
+    
     def closure(self, items):
-        """Compute closure of a set of LR(1) items"""
-        closure_set = set(items)
-        changed = True
-        
-        while changed:
-            changed = False
-            new_items = set()
-            
-            for item in closure_set:
-                next_sym = item.next_symbol()
-                if next_sym and next_sym in self.non_terminals:
-                    # Compute FIRST(βa) where β is rest of production and a is lookahead
-                    beta = item.rhs[item.dot_pos + 1:]
-                    
-                    # Compute lookaheads for new items
-                    lookaheads = set()
-                    if beta:
-                        # FIRST(β) - for simplicity, take first symbol only
-                        for symbol in beta:
-                            lookaheads.update(self.first.get(symbol, set()) - {'ε'})
-                            # If symbol is terminal or non-nullable non-terminal, stop
-                            if symbol in self.terminals:
-                                break
-                            # Assume non-terminals are not nullable
-                            break
-                        else:
-                            # All of β is nullable (shouldn't happen with our simplification)
-                            lookaheads.add(item.lookahead)
-                    else:
-                        # Just use current lookahead
-                        lookaheads.add(item.lookahead)
-                    
-                    # Add items for all productions of next_sym
-                    for production in self.grammar.get(next_sym, []):
-                        for la in lookaheads:
-                            new_item = LR1Item(next_sym, production, 0, la)
-                            if new_item not in closure_set:
-                                new_items.add(new_item)
-                                changed = True
+        """Compute closure of a set of LR(1) items, given as {core: lookahead bits}"""
+        # Each production is expanded once however many lookaheads it gets;
+        # pending holds the bits a queued core has not passed on yet
+        lookaheads = {}
+        pending = {}
+        work = deque()
+        
+        def add(core, bits):
+            new_bits = bits & ~lookaheads.get(core, 0)
+            if new_bits:
+                lookaheads[core] = lookaheads.get(core, 0) | new_bits
+                if core not in pending:
+                    pending[core] = 0
+                    work.append(core)
+                pending[core] |= new_bits
+        
+        for core, bits in items.items():
+            add(core, bits)
+        
+        not_eps = ~self.term_bit.get('ε', 0)
+        non_terminals = self.non_terminals
+        first_bits = self.first_bits
+        initial_cores = self.initial_cores
+        
+        while work:
+            core = work.popleft()
+            new_bits = pending.pop(core)
+            _, rhs, dot_pos = core
             
-            closure_set.update(new_items)
+            if dot_pos < len(rhs) and rhs[dot_pos] in non_terminals:
+                if dot_pos + 1 < len(rhs):
+                    # FIRST(β) - for simplicity, take first symbol only, as
+                    # non-terminals are assumed not nullable
+                    bits = first_bits.get(rhs[dot_pos + 1], 0) & not_eps
+                else:
+                    # Just pass on the current lookaheads
+                    bits = new_bits
+                
+                # Add items for all productions of next_sym
+                for new_core in initial_cores[rhs[dot_pos]]:
+                    add(new_core, bits)
         
-        return closure_set
+        return lookaheads
+    
+    def goto_kernel(self, items, symbol):
+        """Items of GOTO(items, symbol) before closure"""
+        moved_items = {}
+        
+        for (lhs, rhs, dot_pos), bits in items.items():
+            if dot_pos < len(rhs) and rhs[dot_pos] == symbol:
+                moved_items[(lhs, rhs, dot_pos + 1)] = bits
+        
+        return moved_items
     
     def goto(self, items, symbol):
         """Compute GOTO(items, symbol) for LR(1)"""
-        moved_items = set()
-        
-        for item in items:
-            if item.next_symbol() == symbol:
-                moved_items.add(item.advance())
+        moved_items = self.goto_kernel(items, symbol)
         
         if not moved_items:
             return None
@@ -251,50 +366,59 @@ class LALRAnalyzer:
         print("\n=== BUILDING LALR(1) AUTOMATON ===\n")
         print("Step 1: Building LR(1) automaton")
         
-        # First, build LR(1) automaton
+        # First, build LR(1) automaton. Each LR(1) state joins the group of
+        # its core as soon as it is created; groups are numbered in order of
+        # first appearance and become the LALR(1) states. A state is keyed
+        # by its kernel, which determines its closure, so a kernel reached
+        # again is found without closing it
         lr1_states = []
         lr1_state_map = {}
-        lr1_transitions = {}
+        core_ids = {}
+        core_groups = []
+        lalr_of = []  # LALR(1) state id of each LR(1) state
+        
+        def add_lr1_state(items, key):
+            state = LALRState(len(lr1_states), items)
+            lr1_states.append(state)
+            lr1_state_map[key] = state
+            
+            lalr_id = core_ids.setdefault(state.core(), len(core_ids))
+            if lalr_id == len(core_groups):
+                core_groups.append([])
+            core_groups[lalr_id].append(state)
+            lalr_of.append(lalr_id)
+            return state
         
         # Create initial item with $ as lookahead
-        initial_item = LR1Item(self.augmented_start, 
-                              self.grammar[self.augmented_start][0], 
-                              0,
-                              '$')
-        initial_items = self.closure({initial_item})
-        initial_items_frozen = frozenset(initial_items)
-        
-        initial_state = LALRState(0, initial_items)
-        lr1_states.append(initial_state)
-        lr1_state_map[initial_items_frozen] = initial_state
+        initial_kernel = {(self.augmented_start, self.grammar[self.augmented_start][0], 0): self.term_bit['$']}
+        initial_state = add_lr1_state(self.closure(initial_kernel), frozenset(initial_kernel.items()))
         
         queue = deque([initial_state])
         
         while queue:
             current_state = queue.popleft()
             
-            # Find all symbols that can be shifted
-            symbols_to_process = set()
-            for item in current_state.items:
-                next_sym = item.next_symbol()
-                if next_sym:
-                    symbols_to_process.add(next_sym)
+            # Advance every item that can shift in one pass, bucketed by the
+            # shifted symbol; each bucket is the kernel of one GOTO
+            kernels = defaultdict(dict)
+            for (lhs, rhs, dot_pos), bits in current_state.items.items():
+                if dot_pos < len(rhs):
+                    kernels[rhs[dot_pos]][(lhs, rhs, dot_pos + 1)] = bits
             
-            for symbol in symbols_to_process:
-                goto_items = self.goto(current_state.items, symbol)
+            # Sorted, so state numbering does not depend on set order
+            for symbol in sorted(kernels):
+                kernel = kernels[symbol]
+                kernel_frozen = frozenset(kernel.items())
                 
-                if goto_items:
-                    goto_items_frozen = frozenset(goto_items)
-                    
-                    if goto_items_frozen in lr1_state_map:
-                        next_state = lr1_state_map[goto_items_frozen]
-                    else:
-                        next_state = LALRState(len(lr1_states), goto_items)
-                        lr1_states.append(next_state)
-                        lr1_state_map[goto_items_frozen] = next_state
-                        queue.append(next_state)
-                    
-                    lr1_transitions[(current_state.id, symbol)] = next_state.id
+                if kernel_frozen in lr1_state_map:
+                    next_state = lr1_state_map[kernel_frozen]
+                else:
+                    next_state = add_lr1_state(self.closure(kernel), kernel_frozen)
+                    queue.append(next_state)
+                
+                # States with the same core have the same transitions, so
+                # this records the LALR(1) transition directly
+                self.transitions[(lalr_of[current_state.id], symbol)] = lalr_of[next_state.id]
         
         self.lr1_state_count = len(lr1_states)
         print(f"  Created {len(lr1_states)} LR(1) states")
@@ -302,47 +426,23 @@ class LALRAnalyzer:
         # Step 2: Merge states with same core
         print("\nStep 2: Merging states with same core")
         
-        # Group states by core
-        core_groups = defaultdict(list)
-        for state in lr1_states:
-            core = state.core()
-            core_groups[core].append(state)
-        
         # Create merged LALR states
-        core_to_lalr = {}
-        lalr_id = 0
-        
-        for core, states in core_groups.items():
-            # Merge all items from states with same core
-            merged_items = set()
-            merged_from = []
+        for lalr_id, (core, states) in enumerate(zip(core_ids, core_groups)):
+            # Merge all items from states with same core by joining lookaheads
+            merged_items = {}
             
             for state in states:
-                merged_items.update(state.items)
-                merged_from.append(state.id)
+                for item_core, bits in state.items.items():
+                    merged_items[item_core] = merged_items.get(item_core, 0) | bits
             
+            merged_from = array('i', [state.id for state in states]) if len(states) > 1 else None
             lalr_state = LALRState(lalr_id, merged_items, merged_from)
-            core_to_lalr[core] = lalr_state
+            self.core_map[core] = lalr_state
             self.states.append(lalr_state)
-            lalr_id += 1
         
         print(f"  Merged into {len(self.states)} LALR(1) states")
         print(f"  Reduction: {self.lr1_state_count} → {len(self.states)} states")
         
-        # Build transitions for LALR automaton
-        for (from_id, symbol), to_id in lr1_transitions.items():
-            from_state = lr1_states[from_id]
-            to_state = lr1_states[to_id]
-            
-            from_lalr = core_to_lalr[from_state.core()]
-            to_lalr = core_to_lalr[to_state.core()]
-            
-            self.transitions[(from_lalr.id, symbol)] = to_lalr.id
-        
-        # Build state_map for consistency
-        for state in self.states:
-            self.state_map[state.items] = state
-        
         print(f"  Created {len(self.transitions)} transitions")
     
     def build_parsing_tables(self):
@@ -352,18 +452,18 @@ class LALRAnalyzer:
         for state in self.states:
             state_actions = defaultdict(set)
             
-            for item in state.items:
-                if item.is_complete():
-                    if item.lhs == self.augmented_start:
+            for (lhs, rhs, dot_pos), bits in state.items.items():
+                if dot_pos >= len(rhs):
+                    if lhs == self.augmented_start:
                         state_actions['$'].add('accept')
                     else:
-                        prod_num = self.get_production_number(item.lhs, item.rhs)
-                        reduce_action = f"r{prod_num}"
+                        reduce_action = f"r{self.production_numbers[(lhs, rhs)]}"
                         
-                        # LALR: Add reduce for the specific lookahead symbol
-                        state_actions[item.lookahead].add(reduce_action)
+                        # LALR: Add reduce for each lookahead symbol
+                        for lookahead in self.iter_terminals(bits):
+                            state_actions[lookahead].add(reduce_action)
                 else:
-                    next_sym = item.next_symbol()
+                    next_sym = rhs[dot_pos]
                     if next_sym in self.terminals:
                         if (state.id, next_sym) in self.transitions:
                             next_state = self.transitions[(state.id, next_sym)]
@@ -371,22 +471,23 @@ class LALRAnalyzer:
                             state_actions[next_sym].add(shift_action)
             
             for terminal, actions in state_actions.items():
-                actions_list = sorted(list(actions))
+                if len(actions) == 1:
+                    self.action_table[state.id][terminal] = next(iter(actions))
+                    continue
                 
-                if len(actions_list) == 1:
-                    self.action_table[state.id][terminal] = actions_list[0]
-                else:
-                    conflict_type = 'reduce-reduce' if all(a.startswith('r') or a == 'accept' for a in actions_list) else 'shift-reduce'
-                    
-                    self.conflicts.append({
-                        'state': state.id,
-                        'symbol': terminal,
-                        'type': conflict_type,
-                        'action1': actions_list[0],
-                        'action2': actions_list[1] if len(actions_list) > 1 else ''
-                    })
-                    
-                    self.action_table[state.id][terminal] = ' / '.join(actions_list)
+                # Conflict: only these cells need a sorted action list
+                actions_list = sorted(actions)
+                conflict_type = 'reduce-reduce' if all(a.startswith('r') or a == 'accept' for a in actions_list) else 'shift-reduce'
+                
+                self.conflicts.append({
+                    'state': state.id,
+                    'symbol': terminal,
+                    'type': conflict_type,
+                    'action1': actions_list[0],
+                    'action2': actions_list[1]
+                })
+                
+                self.action_table[state.id][terminal] = ' / '.join(actions_list)
             
             for non_terminal in self.non_terminals:
                 if (state.id, non_terminal) in self.transitions:
@@ -405,24 +506,7 @@ class LALRAnalyzer:
         """Get production number for A → α
         Production 0 is always the augmented production
         """
-        prod_num = 0
-        
-        # First, check augmented production (always production 0)
-        if lhs == self.augmented_start:
-            for prod in self.grammar[self.augmented_start]:
-                if prod == rhs:
-                    return prod_num
-                prod_num += 1
-        
-        # Then number the rest in order (excluding augmented start)
-        for nt in sorted(self.grammar.keys()):
-            if nt == self.augmented_start:
-                continue
-            for prod in self.grammar[nt]:
-                if nt == lhs and prod == rhs:
-                    return prod_num
-                prod_num += 1
-        return -1
+        return self.production_numbers.get((lhs, tuple(rhs)), -1)
     
     def is_lalr(self):
         """Check if grammar is LALR(1)"""
@@ -430,116 +514,91 @@ class LALRAnalyzer:
     
     def generate_excel(self, filename='lalr_analysis.xlsx'):
         """Generate Excel file with complete analysis"""
-        wb = openpyxl.Workbook()
-        wb.remove(wb.active)
-        
-        self.create_result_sheet(wb)
-        self.create_grammar_sheet(wb)
-        self.create_first_sheet(wb)
-        self.create_states_sheet(wb)
-        self.create_action_table_sheet(wb)
-        self.create_goto_table_sheet(wb)
-        self.create_transitions_sheet(wb)
+        # Write-only workbooks stream each row out as it is appended instead
+        # of keeping every cell in memory until save
+        wb = openpyxl.Workbook(write_only=True)
+        styles = _excel_styles()
+        
+        self.create_result_sheet(wb, styles)
+        self.create_grammar_sheet(wb, styles)
+        self.create_first_sheet(wb, styles)
+        self.create_states_sheet(wb, styles)
+        self.create_action_table_sheet(wb, styles)
+        self.create_goto_table_sheet(wb, styles)
+        self.create_transitions_sheet(wb, styles)
         
         wb.save(filename)
         print(f"\n✅ Excel file created: {filename}")
     
-    def create_result_sheet(self, wb):
+    def create_result_sheet(self, wb, styles):
         """Create result sheet"""
         ws = wb.create_sheet("Result", 0)
         
-        ws['A1'] = "LALR(1) Parser Analysis Result"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws.merge_cells('A1:D1')
+        ws.column_dimensions['A'].width = 30
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 20
+        ws.column_dimensions['D'].width = 20
+        ws.column_dimensions['E'].width = 20
         
-        ws['A3'] = "Is LALR(1)?"
-        ws['A3'].font = Font(bold=True, size=14)
+        ws.append([_styled_cell(ws, "LALR(1) Parser Analysis Result", font=styles['title'])])
+        ws.merged_cells.add('A1:D1')
+        ws.append([])
         
         is_lalr = self.is_lalr()
-        ws['B3'] = "YES ✓" if is_lalr else "NO ✗"
-        ws['B3'].font = Font(bold=True, size=14, color="008000" if is_lalr else "FF0000")
-        
-        ws['A5'] = "LR(1) States (before merge):"
-        ws['A5'].font = Font(bold=True)
-        ws['B5'] = self.lr1_state_count
-        
-        ws['A6'] = "LALR(1) States (after merge):"
-        ws['A6'].font = Font(bold=True)
-        ws['B6'] = len(self.states)
-        
-        ws['A7'] = "States Reduced:"
-        ws['A7'].font = Font(bold=True)
-        ws['B7'] = self.lr1_state_count - len(self.states)
-        ws['B7'].font = Font(color="008000" if (self.lr1_state_count - len(self.states)) > 0 else "000000")
-        
-        ws['A9'] = "Number of Conflicts:"
-        ws['A9'].font = Font(bold=True)
-        ws['B9'] = len(self.conflicts)
+        ws.append([
+            _styled_cell(ws, "Is LALR(1)?", font=styles['heading']),
+            _styled_cell(ws, "YES ✓" if is_lalr else "NO ✗",
+                         font=styles['heading_green' if is_lalr else 'heading_red']),
+        ])
+        ws.append([])
+        
+        states_reduced = self.lr1_state_count - len(self.states)
+        ws.append([_styled_cell(ws, "LR(1) States (before merge):", font=styles['bold']), self.lr1_state_count])
+        ws.append([_styled_cell(ws, "LALR(1) States (after merge):", font=styles['bold']), len(self.states)])
+        ws.append([
+            _styled_cell(ws, "States Reduced:", font=styles['bold']),
+            _styled_cell(ws, states_reduced, font=styles['green' if states_reduced > 0 else 'black']),
+        ])
+        ws.append([])
+        
+        ws.append([_styled_cell(ws, "Number of Conflicts:", font=styles['bold']), len(self.conflicts)])
+        ws.append([])
         
         if self.conflicts:
-            ws['A11'] = "Conflicts Details:"
-            ws['A11'].font = Font(bold=True, size=12, color="FF0000")
-            ws.merge_cells('A11:E11')
-            
-            ws['A13'] = "State"
-            ws['B13'] = "Symbol"
-            ws['C13'] = "Conflict Type"
-            ws['D13'] = "Action 1"
-            ws['E13'] = "Action 2"
+            ws.append([_styled_cell(ws, "Conflicts Details:", font=styles['subheading_red'])])
+            ws.merged_cells.add('A11:E11')
+            ws.append([])
             
-            for cell in ['A13', 'B13', 'C13', 'D13', 'E13']:
-                ws[cell].font = Font(bold=True, size=11)
-                ws[cell].fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-                ws[cell].alignment = Alignment(horizontal='center', vertical='center')
+            ws.append([_styled_cell(ws, title, font=styles['bold_small'], fill=styles['fill_gold'],
+                                    alignment=styles['center_both'])
+                       for title in ["State", "Symbol", "Conflict Type", "Action 1", "Action 2"]])
             
-            row = 14
             for conflict in self.conflicts:
-                ws[f'A{row}'] = conflict['state']
-                ws[f'B{row}'] = conflict['symbol']
-                ws[f'C{row}'] = conflict['type']
-                ws[f'D{row}'] = conflict['action1']
-                ws[f'E{row}'] = conflict['action2']
-                
-                for col in ['A', 'B', 'C', 'D', 'E']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                
-                row += 1
+                ws.append([_styled_cell(ws, conflict[key], fill=styles['fill_red_light'])
+                           for key in ('state', 'symbol', 'type', 'action1', 'action2')])
         else:
-            ws['A11'] = "✓ No conflicts found - Grammar is LALR(1)!"
-            ws['A11'].font = Font(bold=True, size=12, color="008000")
-            ws.merge_cells('A11:D11')
-        
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 20
-        ws.column_dimensions['E'].width = 20
+            ws.append([_styled_cell(ws, "✓ No conflicts found - Grammar is LALR(1)!",
+                                    font=styles['subheading_green'])])
+            ws.merged_cells.add('A11:D11')
     
-    def create_grammar_sheet(self, wb):
+    def create_grammar_sheet(self, wb, styles):
         """Create grammar sheet with correct production numbering"""
         ws = wb.create_sheet("Grammar")
         
-        ws['A1'] = "Production #"
-        ws['B1'] = "Non-Terminal"
-        ws['C1'] = "Production"
+        ws.column_dimensions['A'].width = 15
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 40
         
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_blue'])
+                   for title in ["Production #", "Non-Terminal", "Production"]])
         
-        row = 2
         prod_num = 0
         
         # First, add augmented production (production 0)
         for prod in self.grammar[self.augmented_start]:
-            ws[f'A{row}'] = prod_num
-            ws[f'B{row}'] = self.augmented_start
-            ws[f'C{row}'] = f"{self.augmented_start} → {' '.join(prod)}"
-            ws[f'A{row}'].fill = PatternFill(start_color="FFE699", end_color="FFE699", fill_type="solid")
-            ws[f'B{row}'].fill = PatternFill(start_color="FFE699", end_color="FFE699", fill_type="solid")
-            ws[f'C{row}'].fill = PatternFill(start_color="FFE699", end_color="FFE699", fill_type="solid")
-            row += 1
+            ws.append([_styled_cell(ws, value, fill=styles['fill_yellow'])
+                       for value in (prod_num, self.augmented_start,
+                                     f"{self.augmented_start} → {' '.join(prod)}")])
             prod_num += 1
         
         # Then add the rest in sorted order
@@ -547,173 +606,124 @@ class LALRAnalyzer:
             if nt == self.augmented_start:
                 continue
             for prod in self.grammar[nt]:
-                ws[f'A{row}'] = prod_num
-                ws[f'B{row}'] = nt
-                ws[f'C{row}'] = f"{nt} → {' '.join(prod)}"
-                row += 1
+                ws.append([prod_num, nt, f"{nt} → {' '.join(prod)}"])
                 prod_num += 1
-        
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 40
     
-    def create_first_sheet(self, wb):
+    def create_first_sheet(self, wb, styles):
         """Create FIRST sets sheet"""
         ws = wb.create_sheet("FIRST Sets")
         
-        ws['A1'] = "Symbol"
-        ws['B1'] = "FIRST Set"
-        ws['C1'] = "Explanation"
-        
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
-        
-        row = 2
-        for A in sorted(self.non_terminals):
-            ws[f'A{row}'] = A
-            ws[f'B{row}'] = ', '.join(sorted(self.first.get(A, set())))
-            ws[f'C{row}'] = "Used for computing lookaheads in LALR"
-            row += 1
-        
         ws.column_dimensions['A'].width = 20
         ws.column_dimensions['B'].width = 30
         ws.column_dimensions['C'].width = 40
+        
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_gold'])
+                   for title in ["Symbol", "FIRST Set", "Explanation"]])
+        
+        for A in sorted(self.non_terminals):
+            ws.append([A, ', '.join(sorted(self.first.get(A, set()))), "Used for computing lookaheads in LALR"])
     
-    def create_states_sheet(self, wb):
+    def create_states_sheet(self, wb, styles):
         """Create states sheet"""
         ws = wb.create_sheet("States")
         
-        ws['A1'] = "State"
-        ws['B1'] = "LALR(1) Items"
-        ws['C1'] = "Merged from LR(1) States"
+        ws.column_dimensions['A'].width = 15
+        ws.column_dimensions['B'].width = 60
+        ws.column_dimensions['C'].width = 25
         
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="5B9BD5", end_color="5B9BD5", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_sky'])
+                   for title in ["State", "LALR(1) Items", "Merged from LR(1) States"]])
         
-        row = 2
-        for state in self.states:
-            ws[f'A{row}'] = f"State {state.id}"
-            ws[f'A{row}'].font = Font(bold=True)
+        # Row heights must be set before their row is streamed
+        for row, state in enumerate(self.states, start=2):
+            items = self.state_items(state)
+            items_text = "\n".join(str(item) for item in sorted(items, key=str))
+            ws.row_dimensions[row].height = 15 * len(items)
             
-            items_text = "\n".join(str(item) for item in sorted(state.items, key=str))
-            ws[f'B{row}'] = items_text
-            ws[f'B{row}'].alignment = Alignment(wrap_text=True, vertical='top')
-            
-            if state.merged_from and len(state.merged_from) > 1:
-                ws[f'C{row}'] = f"States: {', '.join(map(str, sorted(state.merged_from)))}"
-                ws[f'C{row}'].fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
+            if state.merged_from:
+                merged_cell = _styled_cell(ws, f"States: {', '.join(map(str, sorted(state.merged_from)))}",
+                                           fill=styles['fill_green_light'], alignment=styles['wrap'])
             else:
-                ws[f'C{row}'] = "Not merged"
-            
-            ws[f'C{row}'].alignment = Alignment(wrap_text=True, vertical='top')
+                merged_cell = _styled_cell(ws, "Not merged", alignment=styles['wrap'])
             
-            ws.row_dimensions[row].height = 15 * len(state.items)
-            
-            row += 1
-        
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 60
-        ws.column_dimensions['C'].width = 25
+            ws.append([
+                _styled_cell(ws, f"State {state.id}", font=styles['bold']),
+                _styled_cell(ws, items_text, alignment=styles['wrap']),
+                merged_cell,
+            ])
     
-    def create_action_table_sheet(self, wb):
+    def create_action_table_sheet(self, wb, styles):
         """Create ACTION table sheet"""
         ws = wb.create_sheet("ACTION Table")
         
         terminals_sorted = sorted(self.terminals)
         
-        ws['A1'] = "State"
-        for col_idx, terminal in enumerate(terminals_sorted, start=2):
-            ws.cell(1, col_idx, terminal)
+        ws.column_dimensions['A'].width = 10
+        for col_idx in range(2, len(terminals_sorted) + 2):
+            ws.column_dimensions[get_column_letter(col_idx)].width = 12
         
-        for col_idx in range(1, len(terminals_sorted) + 2):
-            cell = ws.cell(1, col_idx)
-            cell.font = Font(bold=True, size=11)
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.font = Font(bold=True, size=11, color="FFFFFF")
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+        ws.append([_styled_cell(ws, title, font=styles['header_small'], fill=styles['fill_blue'],
+                                alignment=styles['center_both'])
+                   for title in ["State"] + terminals_sorted])
         
+        # States are numbered from 0 in order, so state i lands on row i + 2
         for state in self.states:
-            row = state.id + 2
-            ws.cell(row, 1, state.id)
-            ws.cell(row, 1).font = Font(bold=True)
+            actions = self.action_table[state.id]
+            row_cells = [_styled_cell(ws, state.id, font=styles['bold'])]
             
-            for col_idx, terminal in enumerate(terminals_sorted, start=2):
-                if terminal in self.action_table[state.id]:
-                    action = self.action_table[state.id][terminal]
-                    ws.cell(row, col_idx, action)
-                    
-                    if '/' in action:
-                        ws.cell(row, col_idx).fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-                        ws.cell(row, col_idx).font = Font(color="FFFFFF", bold=True)
+            for terminal in terminals_sorted:
+                action = actions.get(terminal)
+                
+                if action is None:
+                    row_cells.append(_styled_cell(ws, "-", alignment=styles['center']))
+                elif '/' in action:
+                    row_cells.append(_styled_cell(ws, action, font=styles['white_bold'], fill=styles['fill_red']))
                 else:
-                    ws.cell(row, col_idx, "-")
-                    ws.cell(row, col_idx).alignment = Alignment(horizontal='center')
-        
-        ws.column_dimensions['A'].width = 10
-        for col_idx in range(2, len(terminals_sorted) + 2):
-            ws.column_dimensions[get_column_letter(col_idx)].width = 12
+                    row_cells.append(action)
+            
+            ws.append(row_cells)
     
-    def create_goto_table_sheet(self, wb):
+    def create_goto_table_sheet(self, wb, styles):
         """Create GOTO table sheet"""
         ws = wb.create_sheet("GOTO Table")
         
         non_terminals_sorted = sorted(self.non_terminals)
         
-        ws['A1'] = "State"
-        for col_idx, non_terminal in enumerate(non_terminals_sorted, start=2):
-            ws.cell(1, col_idx, non_terminal)
+        ws.column_dimensions['A'].width = 10
+        for col_idx in range(2, len(non_terminals_sorted) + 2):
+            ws.column_dimensions[get_column_letter(col_idx)].width = 12
         
-        for col_idx in range(1, len(non_terminals_sorted) + 2):
-            cell = ws.cell(1, col_idx)
-            cell.font = Font(bold=True, size=11)
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.font = Font(bold=True, size=11, color="FFFFFF")
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+        ws.append([_styled_cell(ws, title, font=styles['header_small'], fill=styles['fill_blue'],
+                                alignment=styles['center_both'])
+                   for title in ["State"] + non_terminals_sorted])
         
         for state in self.states:
-            row = state.id + 2
-            ws.cell(row, 1, state.id)
-            ws.cell(row, 1).font = Font(bold=True)
+            gotos = self.goto_table[state.id]
+            row_cells = [_styled_cell(ws, state.id, font=styles['bold'])]
             
-            for col_idx, non_terminal in enumerate(non_terminals_sorted, start=2):
-                if non_terminal in self.goto_table[state.id]:
-                    goto_state = self.goto_table[state.id][non_terminal]
-                    ws.cell(row, col_idx, goto_state)
+            for non_terminal in non_terminals_sorted:
+                goto_state = gotos.get(non_terminal)
+                
+                if goto_state is None:
+                    row_cells.append(_styled_cell(ws, "-", alignment=styles['center']))
                 else:
-                    ws.cell(row, col_idx, "-")
-                    ws.cell(row, col_idx).alignment = Alignment(horizontal='center')
-        
-        ws.column_dimensions['A'].width = 10
-        for col_idx in range(2, len(non_terminals_sorted) + 2):
-            ws.column_dimensions[get_column_letter(col_idx)].width = 12
+                    row_cells.append(goto_state)
+            
+            ws.append(row_cells)
     
-    def create_transitions_sheet(self, wb):
+    def create_transitions_sheet(self, wb, styles):
         """Create transitions sheet"""
         ws = wb.create_sheet("Transitions")
         
-        ws['A1'] = "From State"
-        ws['B1'] = "Symbol"
-        ws['C1'] = "To State"
-        
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="ED7D31", end_color="ED7D31", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
-        
-        row = 2
-        for (from_state, symbol), to_state in sorted(self.transitions.items()):
-            ws[f'A{row}'] = from_state
-            ws[f'B{row}'] = symbol
-            ws[f'C{row}'] = to_state
-            row += 1
-        
         ws.column_dimensions['A'].width = 15
         ws.column_dimensions['B'].width = 15
         ws.column_dimensions['C'].width = 15
+        
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_orange'])
+                   for title in ["From State", "Symbol", "To State"]])
+        
+        for (from_state, symbol), to_state in sorted(self.transitions.items()):
+            ws.append([from_state, symbol, to_state])
 
 
 def main():
@@ -4,16 +4,96 @@ Checks if a grammar is LL(1) by computing FIRST and FOLLOW sets
 and building the predictive parsing table
 """
 
-from collections import defaultdict
+from array import array
+import functools
+import hashlib
+import os
+import pickle
+import re
+import sys
+from collections import defaultdict, deque
+from itertools import combinations
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 from grammar import grammar
 
+# A quoted terminal runs to the closing quote (or end of line); anything else
+# is a run of characters up to whitespace or a quote
+_TOKEN_RE = re.compile(r"'[^']*'?|[^\s']+")
+
+# Markers in the dense parsing table besides production numbers
+_NO_ENTRY = -1
+_CONFLICT = -2
+
+# Finished analyses are pickled here, one file per grammar text. Bump
+# _CACHE_VERSION whenever the analysis or the cached fields change so old
+# files are ignored; deleting the directory clears the cache.
+_CACHE_DIR = '.ll1cache'
+_CACHE_VERSION = 2
+_CACHED_FIELDS = (
+    'grammar', 'terminals', 'non_terminals', 'start_symbol', '_sorted_nts',
+    'term_id', '_term_names', 'nt_id', 'prod_index',
+    'first', 'follow', 'first_bits', 'follow_bits', 'first_of_prod',
+    'table', 'parsing_table', 'conflicts',
+)
+
+
+def _excel_styles():
+    """Create the fonts, fills and alignments shared by the analysis sheets"""
+    def solid(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+    
+    return {
+        'title': Font(bold=True, size=16),
+        'heading': Font(bold=True, size=14),
+        'heading_green': Font(bold=True, size=14, color="008000"),
+        'heading_red': Font(bold=True, size=14, color="FF0000"),
+        'subheading_green': Font(bold=True, size=12, color="008000"),
+        'subheading_red': Font(bold=True, size=12, color="FF0000"),
+        'header': Font(bold=True, size=12, color="FFFFFF"),
+        'header_small': Font(bold=True, size=11, color="FFFFFF"),
+        'bold_small': Font(bold=True, size=11),
+        'bold': Font(bold=True),
+        'white_bold': Font(bold=True, color="FFFFFF"),
+        'note': Font(color="0000FF", italic=True),
+        'fill_blue': solid("4472C4"),
+        'fill_red': solid("FF0000"),
+        'fill_red_light': solid("FFE6E6"),
+        'fill_gold': solid("FFC000"),
+        'fill_green': solid("70AD47"),
+        'fill_sky': solid("5B9BD5"),
+        'center': Alignment(horizontal='center'),
+        'center_both': Alignment(horizontal='center', vertical='center'),
+        'wrap': Alignment(wrap_text=True, vertical='top'),
+        'wrap_text': Alignment(wrap_text=True),
+    }
+
+
+# openpyxl style objects are immutable, so one palette serves every workbook
+_STYLES = _excel_styles()
+
+
+def _styled_cell(ws, value, font=None, fill=None, alignment=None):
+    """Create a cell carrying the given styles, ready for ws.append"""
+    cell = WriteOnlyCell(ws, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
 
 
 class LL1Analyzer:
-    def __init__(self, grammar_text):
+    def __init__(self, grammar_text, use_cache=True, verbose=True):
+        self.grammar_text = grammar_text
+        # Progress output (section banners, FIRST/FOLLOW listings); off, the
+        # analysis skips formatting it altogether
+        self.verbose = verbose
         self.grammar = {}
         self.terminals = set()
         self.non_terminals = set()
@@ -21,17 +101,98 @@ class LL1Analyzer:
         
         self.first = defaultdict(set)
         self.follow = defaultdict(set)
+        
+        # FIRST/FOLLOW are computed as int bitsets over term_id and decoded
+        # into self.first/self.follow once they are final. Plain dicts: every
+        # grammar symbol is seeded before the fixed points run.
+        self.term_id = {}
+        self.first_bits = {}
+        self.follow_bits = {}
         self.parsing_table = defaultdict(dict)
         self.conflicts = []
         
+        # FIRST bitset of each production, keyed by (A, index in grammar[A]);
+        # filled in once FIRST is final and shared by the table and the checks
+        self.first_of_prod = {}
+        
+        # FIRST of a symbol string only depends on the FIRST sets, so once
+        # those are final each production or suffix is evaluated once
+        self._first_of_tuple = functools.lru_cache(maxsize=None)(self._compute_first_of_tuple)
+        
+        # Set once the parsing table is filled, whether built or loaded
+        self.table_built = False
+        
+        # "A → α" display strings, formatted the first time a report needs them
+        self._prod_strs = {}
+        
+        self.cache_path = None
+        if use_cache:
+            key = hashlib.blake2b(f"{_CACHE_VERSION}\n{grammar_text}".encode("utf-8"), digest_size=16).hexdigest()
+            self.cache_path = os.path.join(_CACHE_DIR, f"{key}.pkl")
+            if self.load_cache():
+                return
+        
         self.parse_grammar(grammar_text)
         self.compute_first()
         self.compute_follow()
-        
+    
+    def load_cache(self):
+        """Restore a finished analysis of this grammar from disk, if one was saved"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+            print(f"Ignoring unreadable analysis cache {self.cache_path}: {e}")
+            return False
+        
+        if not isinstance(state, dict) or set(state) != set(_CACHED_FIELDS):
+            return False
+        
+        self.__dict__.update(state)
+        self.table_built = True
+        
+        if self.verbose:
+            print(f"\n=== LOADED CACHED ANALYSIS ({self.cache_path}) ===\n")
+            self.print_sets("FIRST", self.first)
+            self.print_sets("FOLLOW", self.follow)
+        return True
+    
+    def save_cache(self):
+        """Write the finished analysis to disk for later runs on the same grammar"""
+        if self.cache_path is None:
+            return
+        
+        state = {name: getattr(self, name) for name in _CACHED_FIELDS}
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Readers only ever see a complete file
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not write analysis cache {self.cache_path}: {e}")
+    
+    def format_production(self, A, i):
+        """Return the display string of A's i-th production"""
+        key = (A, i)
+        text = self._prod_strs.get(key)
+        if text is None:
+            text = self._prod_strs[key] = f"{A} → {' '.join(self.grammar[A][i])}"
+        return text
+    
+    def print_sets(self, name, sets):
+        """Print FIRST or FOLLOW sets of every non-terminal"""
+        for A in self._sorted_nts:
+            print(f"{name}({A}) = {{{', '.join(sorted(sets[A]))}}}")
+    
     def parse_grammar(self, grammar_text):
         """Parse the grammar from text format"""
         lines = grammar_text.strip().split('\n')
         current_lhs = None
+        seen_symbols = set()
         
         for line in lines:
             line = line.strip()
@@ -40,7 +201,7 @@ class LL1Analyzer:
                 
             if '→' in line:
                 parts = line.split('→')
-                lhs = parts[0].strip()
+                lhs = sys.intern(parts[0].strip())
                 rhs = parts[1].strip()
                 current_lhs = lhs
                 self.non_terminals.add(lhs)
@@ -50,223 +211,304 @@ class LL1Analyzer:
                 
                 if lhs not in self.grammar:
                     self.grammar[lhs] = []
-                self.grammar[lhs].append(self.parse_production(rhs))
+                production = self.parse_production(rhs)
+                self.grammar[lhs].append(production)
+                seen_symbols.update(production)
                 
             elif '|' in line:
                 rhs = line.split('|')[1].strip()
                 if current_lhs:
-                    self.grammar[current_lhs].append(self.parse_production(rhs))
+                    production = self.parse_production(rhs)
+                    self.grammar[current_lhs].append(production)
+                    seen_symbols.update(production)
         
-        # Extract terminals
-        for lhs, productions in self.grammar.items():
-            for prod in productions:
-                for symbol in prod:
-                    if symbol != 'ε' and symbol not in self.non_terminals:
-                        self.terminals.add(symbol)
+        # Extract terminals: every symbol that never appears on a left-hand side
+        self.terminals = (seen_symbols - self.non_terminals - {'ε'}) | {'$'}  # $ marks end of input
         
-        self.terminals.add('$')  # End of input marker
+        # Production numbers, in the order the Grammar sheet lists them
+        # The symbol sets are final from here on; sort them once for reports
+        self._sorted_nts = sorted(self.non_terminals)
+        
+        self.prod_index = {}
+        prod_num = 0
+        for nt in self._sorted_nts:
+            for prod in self.grammar[nt]:
+                self.prod_index.setdefault((nt, tuple(prod)), prod_num)
+                prod_num += 1
+        
+        # One bit per terminal, ε included
+        self.term_id = {'ε': 0}
+        for t in sorted(self.terminals):
+            self.term_id[t] = len(self.term_id)
+        self._term_names = list(self.term_id)
+        
+        # Dense parsing table: one int16 row per non-terminal (sorted), one
+        # column per term_id, holding the production number or a marker.
+        # The entry strings stay in self.parsing_table for the reports.
+        self.nt_id = {nt: i for i, nt in enumerate(self._sorted_nts)}
+        self.table = array('h', [_NO_ENTRY]) * (len(self.nt_id) * len(self.term_id))
+    
+    def iter_terminals(self, bits):
+        """Yield the names of the terminals set in a bitset, in id order"""
+        names = self._term_names
+        while bits:
+            low = bits & -bits
+            yield names[low.bit_length() - 1]
+            bits ^= low
+    
+    def decode_terminals(self, bits):
+        """Turn a terminal bitset back into a set of terminal names"""
+        return set(self.iter_terminals(bits))
     
     def parse_production(self, rhs):
         """Parse a production right-hand side into symbols"""
+        # Symbols are interned so the set, dict and cache lookups keyed on
+        # them mostly compare by identity
         if rhs == 'ε' or rhs == 'epsilon':
             return ['ε']
         
-        symbols = []
-        i = 0
-        while i < len(rhs):
-            if rhs[i] == "'":
-                j = i + 1
-                while j < len(rhs) and rhs[j] != "'":
-                    j += 1
-                symbols.append(rhs[i:j+1])
-                i = j + 1
-            elif rhs[i].isspace():
-                i += 1
-            else:
-                j = i
-                while j < len(rhs) and not rhs[j].isspace() and rhs[j] != "'":
-                    j += 1
-                symbol = rhs[i:j]
-                if symbol:
-                    symbols.append(symbol)
-                i = j
-        
+        symbols = [sys.intern(s) for s in _TOKEN_RE.findall(rhs)]
         return symbols if symbols else ['ε']
     
     def compute_first(self):
         """Compute FIRST sets for all symbols"""
-        print("\n=== COMPUTING FIRST SETS ===\n")
+        if self.verbose:
+            print("\n=== COMPUTING FIRST SETS ===\n")
+        
+        eps = 1 << self.term_id['ε']
+        first = self.first_bits
         
         # Initialize FIRST for terminals
         for t in self.terminals:
-            self.first[t].add(t)
+            first[t] = 1 << self.term_id[t]
+        
+        first['ε'] = eps
+        
+        nts = self.non_terminals
+        first_of_tuple = self._compute_first_of_tuple
+        
+        # FIRST(A) can only change when the FIRST set of a non-terminal in
+        # one of A's productions does. Productions without one contribute a
+        # fixed set, so they are folded into FIRST(A) up front and never
+        # looked at again.
+        productions_of = {}
+        dependents = {A: set() for A in nts}
+        for A in nts:
+            bits = 0
+            productions_of[A] = []
+            for production in self.grammar[A]:
+                production = tuple(production)
+                symbols = [symbol for symbol in production if symbol in nts]
+                if not symbols:
+                    bits |= first_of_tuple(production)
+                    continue
+                productions_of[A].append(production)
+                for symbol in symbols:
+                    dependents[symbol].add(A)
+            first[A] = bits
+        
+        # Compute FIRST for non-terminals, re-evaluating A only when
+        # something it depends on has grown
+        worklist = deque(self._sorted_nts)
+        queued = set(worklist)
+        while worklist:
+            A = worklist.popleft()
+            queued.discard(A)
+            
+            bits = first[A]
+            for production in productions_of[A]:
+                bits |= first_of_tuple(production)
+            
+            if bits != first[A]:
+                first[A] = bits
+                for B in dependents[A] - queued:
+                    worklist.append(B)
+                    queued.add(B)
         
-        self.first['ε'].add('ε')
+        # Anything cached while the sets were still growing is stale
+        self._first_of_tuple.cache_clear()
         
-        # Compute FIRST for non-terminals
-        changed = True
-        while changed:
-            changed = False
-            for A in self.non_terminals:
-                for production in self.grammar.get(A, []):
-                    before = len(self.first[A])
-                    
-                    # If production is ε
-                    if production == ['ε']:
-                        self.first[A].add('ε')
-                        if len(self.first[A]) > before:
-                            changed = True
-                        continue
-                    
-                    # For each symbol in production
-                    all_nullable = True
-                    for symbol in production:
-                        # Add FIRST(symbol) - {ε} to FIRST(A)
-                        self.first[A].update(self.first.get(symbol, set()) - {'ε'})
-                        
-                        # If symbol doesn't have ε in its FIRST set, stop
-                        if 'ε' not in self.first.get(symbol, set()):
-                            all_nullable = False
-                            break
-                    
-                    # If all symbols are nullable, add ε to FIRST(A)
-                    if all_nullable:
-                        self.first[A].add('ε')
-                    
-                    if len(self.first[A]) > before:
-                        changed = True
+        for A in self.non_terminals:
+            for i, production in enumerate(self.grammar[A]):
+                self.first_of_prod[(A, i)] = self.first_bits_of_string(production)
+        
+        for symbol, bits in first.items():
+            self.first[symbol] = self.decode_terminals(bits)
         
         # Print FIRST sets
-        for A in sorted(self.non_terminals):
-            print(f"FIRST({A}) = {{{', '.join(sorted(self.first[A]))}}}")
+        if self.verbose:
+            self.print_sets("FIRST", self.first)
     
     def compute_first_of_string(self, symbols):
         """Compute FIRST of a string of symbols"""
-        result = set()
+        return self.decode_terminals(self.first_bits_of_string(symbols))
+    
+    def first_bits_of_string(self, symbols):
+        """Compute FIRST of a string of symbols as a terminal bitset"""
+        return self._first_of_tuple(tuple(symbols))
+    
+    def _compute_first_of_tuple(self, symbols):
+        """Compute FIRST bitset of a tuple of symbols (cached by _first_of_tuple)"""
+        eps = 1 << self.term_id['ε']
         
-        if not symbols or symbols == ['ε']:
-            result.add('ε')
-            return result
+        if not symbols or symbols == ('ε',):
+            return eps
         
+        first = self.first_bits
+        result = 0
         all_nullable = True
         for symbol in symbols:
+            symbol_bits = first.get(symbol, 0)
+            
             # Add FIRST(symbol) - {ε}
-            result.update(self.first.get(symbol, set()) - {'ε'})
+            result |= symbol_bits & ~eps
             
             # If symbol is not nullable, stop
-            if 'ε' not in self.first.get(symbol, set()):
+            if not symbol_bits & eps:
                 all_nullable = False
                 break
         
         # If all symbols are nullable, add ε
         if all_nullable:
-            result.add('ε')
+            result |= eps
         
         return result
     
     def compute_follow(self):
         """Compute FOLLOW sets for all non-terminals"""
-        print("\n=== COMPUTING FOLLOW SETS ===\n")
-        
-        # Add $ to FOLLOW of start symbol
-        self.follow[self.start_symbol].add('$')
-        
-        changed = True
-        while changed:
-            changed = False
-            
-            for A in self.non_terminals:
-                for production in self.grammar.get(A, []):
-                    # Skip epsilon productions
-                    if production == ['ε']:
-                        continue
+        if self.verbose:
+            print("\n=== COMPUTING FOLLOW SETS ===\n")
+        
+        eps = 1 << self.term_id['ε']
+        first = self.first_bits
+        follow = self.follow_bits
+        nts = self.non_terminals
+        
+        for A in nts:
+            follow[A] = 0
+        
+        # Add $ to FOLLOW of start symbol (there is none in an empty grammar)
+        if self.start_symbol is not None:
+            follow[self.start_symbol] |= 1 << self.term_id['$']
+        
+        # FIRST(β) is already final, so it goes into FOLLOW(B) once; a
+        # nullable β makes FOLLOW(B) depend on FOLLOW(A), and those edges are
+        # all the propagation below has to follow
+        inherits_to = {A: set() for A in nts}
+        for A in nts:
+            for production in self.grammar[A]:
+                # Skip epsilon productions
+                if production == ['ε']:
+                    continue
+                
+                # Walk the production right to left, carrying FIRST of the
+                # suffix seen so far (trailer) and whether it is nullable
+                trailer = 0
+                tail_nullable = True
+                for B in reversed(production):
+                    if B in nts:
+                        # Add FIRST(β) - {ε} to FOLLOW(B)
+                        follow[B] |= trailer
+                        
+                        # If β is nullable (or empty), add FOLLOW(A) to FOLLOW(B)
+                        if tail_nullable and A != B:
+                            inherits_to[A].add(B)
                     
-                    # For each symbol in production
-                    for i, B in enumerate(production):
-                        if B in self.non_terminals:
-                            before = len(self.follow[B])
-                            
-                            # Get symbols after B
-                            beta = production[i+1:]
-                            
-                            # Add FIRST(β) - {ε} to FOLLOW(B)
-                            first_beta = self.compute_first_of_string(beta)
-                            self.follow[B].update(first_beta - {'ε'})
-                            
-                            # If β is nullable (or empty), add FOLLOW(A) to FOLLOW(B)
-                            if not beta or 'ε' in first_beta:
-                                self.follow[B].update(self.follow[A])
-                            
-                            if len(self.follow[B]) > before:
-                                changed = True
+                    symbol_bits = first.get(B, 0)
+                    if symbol_bits & eps:
+                        trailer |= symbol_bits & ~eps
+                    else:
+                        trailer = symbol_bits
+                        tail_nullable = False
+        
+        # Push each grown FOLLOW set along its edges until nothing changes
+        worklist = deque(self._sorted_nts)
+        queued = set(worklist)
+        while worklist:
+            A = worklist.popleft()
+            queued.discard(A)
+            bits = follow[A]
+            
+            for B in inherits_to[A]:
+                if follow[B] | bits != follow[B]:
+                    follow[B] |= bits
+                    if B not in queued:
+                        worklist.append(B)
+                        queued.add(B)
+        
+        for A, bits in follow.items():
+            self.follow[A] = self.decode_terminals(bits)
         
         # Print FOLLOW sets
-        for A in sorted(self.non_terminals):
-            print(f"FOLLOW({A}) = {{{', '.join(sorted(self.follow[A]))}}}")
+        if self.verbose:
+            self.print_sets("FOLLOW", self.follow)
     
     def build_parsing_table(self):
         """Build LL(1) predictive parsing table"""
-        print("\n=== BUILDING LL(1) PARSING TABLE ===\n")
+        if self.verbose:
+            print("\n=== BUILDING LL(1) PARSING TABLE ===\n")
+        
+        # A table loaded from the cache is already complete
+        if not self.table_built:
+            self.fill_parsing_table()
+            self.table_built = True
+            self.save_cache()
+        
+        if not self.verbose:
+            return
+        
+        print(f"Parsing table entries: {sum(len(row) for row in self.parsing_table.values())}")
+        
+        if self.conflicts:
+            print(f"\n⚠️  Found {len(self.conflicts)} conflict(s)!")
+        else:
+            print("\n✓ No conflicts found - Grammar is LL(1)!")
+    
+    def fill_parsing_table(self):
+        """Fill the parsing table from FIRST/FOLLOW, recording any conflicts"""
+        table = self.table
+        n_cols = len(self.term_id)
+        
+        def add_entry(A, terminal, prod_num, i, conflict_type):
+            cell = self.nt_id[A] * n_cols + self.term_id[terminal]
+            prod_str = self.format_production(A, i)
+            if table[cell] != _NO_ENTRY:
+                # Conflict detected
+                existing = self.parsing_table[A][terminal]
+                self.conflicts.append({
+                    'non_terminal': A,
+                    'terminal': terminal,
+                    'production1': existing,
+                    'production2': prod_str,
+                    'type': conflict_type
+                })
+                self.parsing_table[A][terminal] = f"{existing} / {prod_str}"
+                table[cell] = _CONFLICT
+            else:
+                self.parsing_table[A][terminal] = prod_str
+                table[cell] = prod_num
         
         for A in self.non_terminals:
-            for production in self.grammar.get(A, []):
+            for i, production in enumerate(self.grammar.get(A, [])):
                 prod_num = self.get_production_number(A, production)
-                prod_str = f"{A} → {' '.join(production)}"
                 
-                # Compute FIRST(α) where α is the production
-                first_alpha = self.compute_first_of_string(production)
+                # FIRST(α) where α is the production
+                first_alpha = self.decode_terminals(self.first_of_prod[(A, i)])
                 
                 # For each terminal in FIRST(α) - {ε}
                 for terminal in first_alpha - {'ε'}:
                     if terminal in self.terminals:
-                        if terminal in self.parsing_table[A]:
-                            # Conflict detected
-                            existing = self.parsing_table[A][terminal]
-                            self.conflicts.append({
-                                'non_terminal': A,
-                                'terminal': terminal,
-                                'production1': existing,
-                                'production2': prod_str,
-                                'type': 'FIRST-FIRST conflict'
-                            })
-                            self.parsing_table[A][terminal] = f"{existing} / {prod_str}"
-                        else:
-                            self.parsing_table[A][terminal] = prod_str
+                        add_entry(A, terminal, prod_num, i, 'FIRST-FIRST conflict')
                 
                 # If ε ∈ FIRST(α), for each terminal in FOLLOW(A)
                 if 'ε' in first_alpha:
                     for terminal in self.follow[A]:
                         if terminal in self.terminals:
-                            if terminal in self.parsing_table[A]:
-                                # Conflict detected
-                                existing = self.parsing_table[A][terminal]
-                                self.conflicts.append({
-                                    'non_terminal': A,
-                                    'terminal': terminal,
-                                    'production1': existing,
-                                    'production2': prod_str,
-                                    'type': 'FIRST-FOLLOW conflict'
-                                })
-                                self.parsing_table[A][terminal] = f"{existing} / {prod_str}"
-                            else:
-                                self.parsing_table[A][terminal] = prod_str
-        
-        print(f"Parsing table entries: {sum(len(row) for row in self.parsing_table.values())}")
-        
-        if self.conflicts:
-            print(f"\n⚠️  Found {len(self.conflicts)} conflict(s)!")
-        else:
-            print("\n✓ No conflicts found - Grammar is LL(1)!")
+                            add_entry(A, terminal, prod_num, i, 'FIRST-FOLLOW conflict')
     
     def get_production_number(self, lhs, rhs):
         """Get production number for A → α"""
-        prod_num = 0
-        for nt in sorted(self.grammar.keys()):
-            for prod in self.grammar[nt]:
-                if nt == lhs and prod == rhs:
-                    return prod_num
-                prod_num += 1
-        return -1
+        return self.prod_index.get((lhs, tuple(rhs)), -1)
     
     def is_ll1(self):
         """Check if grammar is LL(1)"""
@@ -275,334 +517,299 @@ class LL1Analyzer:
     def check_ll1_conditions(self):
         """Check specific LL(1) conditions and return violations"""
         violations = []
+        eps = 1 << self.term_id['ε']
         
         for A in self.non_terminals:
             productions = self.grammar.get(A, [])
+            firsts = [self.first_of_prod[(A, i)] for i in range(len(productions))]
+            follow_A = self.follow_bits.get(A, 0)
+            
+            # Only pairs that can break a condition are visited: two
+            # productions sharing a FIRST terminal, two nullable ones, or a
+            # nullable one next to one whose FIRST meets FOLLOW(A)
+            buckets = defaultdict(list)
+            for i, bits in enumerate(firsts):
+                for terminal in self.iter_terminals(bits & ~eps):
+                    buckets[terminal].append(i)
             
-            # Check for each pair of productions
-            for i, prod1 in enumerate(productions):
-                first1 = self.compute_first_of_string(prod1)
+            candidates = set()
+            for indices in buckets.values():
+                candidates.update(combinations(indices, 2))
+            
+            nullable = [i for i, bits in enumerate(firsts) if bits & eps]
+            candidates.update(combinations(nullable, 2))
+            for i in nullable:
+                for j, bits in enumerate(firsts):
+                    if i != j and bits & follow_A & ~eps:
+                        candidates.add((min(i, j), max(i, j)))
+            
+            # Check each candidate pair of productions, in production order
+            for i, j in sorted(candidates):
+                prod1, first1 = self.format_production(A, i), firsts[i]
+                prod2, first2 = self.format_production(A, j), firsts[j]
                 
-                for j, prod2 in enumerate(productions):
-                    if i >= j:
-                        continue
-                    
-                    first2 = self.compute_first_of_string(prod2)
-                    
-                    # Condition 1: FIRST sets must be disjoint
-                    intersection = (first1 - {'ε'}) & (first2 - {'ε'})
-                    if intersection:
+                # Condition 1: FIRST sets must be disjoint
+                intersection = self.decode_terminals(first1 & first2 & ~eps)
+                if intersection:
+                    violations.append({
+                        'condition': 'FIRST sets not disjoint',
+                        'non_terminal': A,
+                        'production1': prod1,
+                        'production2': prod2,
+                        'intersection': intersection
+                    })
+                
+                # Condition 2: At most one production can derive ε
+                if first1 & first2 & eps:
+                    violations.append({
+                        'condition': 'Multiple ε-productions',
+                        'non_terminal': A,
+                        'production1': prod1,
+                        'production2': prod2,
+                        'intersection': set()
+                    })
+                
+                # Condition 3: If one can derive ε, FIRST and FOLLOW must be disjoint
+                if first1 & eps:
+                    follow_first_intersection = self.decode_terminals(first2 & follow_A & ~eps)
+                    if follow_first_intersection:
                         violations.append({
-                            'condition': 'FIRST sets not disjoint',
+                            'condition': 'FIRST-FOLLOW conflict',
                             'non_terminal': A,
-                            'production1': f"{A} → {' '.join(prod1)}",
-                            'production2': f"{A} → {' '.join(prod2)}",
-                            'intersection': intersection
+                            'production1': f"{prod1} (nullable)",
+                            'production2': prod2,
+                            'intersection': follow_first_intersection
                         })
-                    
-                    # Condition 2: At most one production can derive ε
-                    if 'ε' in first1 and 'ε' in first2:
+                
+                if first2 & eps:
+                    follow_first_intersection = self.decode_terminals(first1 & follow_A & ~eps)
+                    if follow_first_intersection:
                         violations.append({
-                            'condition': 'Multiple ε-productions',
+                            'condition': 'FIRST-FOLLOW conflict',
                             'non_terminal': A,
-                            'production1': f"{A} → {' '.join(prod1)}",
-                            'production2': f"{A} → {' '.join(prod2)}",
-                            'intersection': set()
+                            'production1': prod1,
+                            'production2': f"{prod2} (nullable)",
+                            'intersection': follow_first_intersection
                         })
-                    
-                    # Condition 3: If one can derive ε, FIRST and FOLLOW must be disjoint
-                    if 'ε' in first1:
-                        follow_first_intersection = (first2 - {'ε'}) & self.follow[A]
-                        if follow_first_intersection:
-                            violations.append({
-                                'condition': 'FIRST-FOLLOW conflict',
-                                'non_terminal': A,
-                                'production1': f"{A} → {' '.join(prod1)} (nullable)",
-                                'production2': f"{A} → {' '.join(prod2)}",
-                                'intersection': follow_first_intersection
-                            })
-                    
-                    if 'ε' in first2:
-                        follow_first_intersection = (first1 - {'ε'}) & self.follow[A]
-                        if follow_first_intersection:
-                            violations.append({
-                                'condition': 'FIRST-FOLLOW conflict',
-                                'non_terminal': A,
-                                'production1': f"{A} → {' '.join(prod1)}",
-                                'production2': f"{A} → {' '.join(prod2)} (nullable)",
-                                'intersection': follow_first_intersection
-                            })
         
         return violations
     
     def generate_excel(self, filename='ll1_analysis.xlsx'):
         """Generate Excel file with complete analysis"""
-        wb = openpyxl.Workbook()
-        wb.remove(wb.active)
-        
-        self.create_result_sheet(wb)
-        self.create_grammar_sheet(wb)
-        self.create_first_sheet(wb)
-        self.create_follow_sheet(wb)
-        self.create_parsing_table_sheet(wb)
-        self.create_conditions_sheet(wb)
+        # Write-only workbooks stream each row out as it is appended instead
+        # of keeping every cell in memory until save
+        wb = openpyxl.Workbook(write_only=True)
+        styles = _STYLES
+        
+        self.create_result_sheet(wb, styles)
+        self.create_grammar_sheet(wb, styles)
+        self.create_first_sheet(wb, styles)
+        self.create_follow_sheet(wb, styles)
+        self.create_parsing_table_sheet(wb, styles)
+        self.create_conditions_sheet(wb, styles)
         
         wb.save(filename)
         print(f"\n✅ Excel file created: {filename}")
     
-    def create_result_sheet(self, wb):
+    def create_result_sheet(self, wb, styles):
         """Create result sheet"""
         ws = wb.create_sheet("Result", 0)
         
-        ws['A1'] = "LL(1) Parser Analysis Result"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws.merge_cells('A1:D1')
+        ws.column_dimensions['A'].width = 25
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 25
+        ws.column_dimensions['D'].width = 35
+        ws.column_dimensions['E'].width = 35
         
-        ws['A3'] = "Is LL(1)?"
-        ws['A3'].font = Font(bold=True, size=14)
+        ws.append([_styled_cell(ws, "LL(1) Parser Analysis Result", font=styles['title'])])
+        ws.merged_cells.add('A1:D1')
+        ws.append([])
         
         is_ll1 = self.is_ll1()
-        ws['B3'] = "YES ✓" if is_ll1 else "NO ✗"
-        ws['B3'].font = Font(bold=True, size=14, color="008000" if is_ll1 else "FF0000")
-        
-        ws['A5'] = "Number of Non-Terminals:"
-        ws['A5'].font = Font(bold=True)
-        ws['B5'] = len(self.non_terminals)
-        
-        ws['A6'] = "Number of Terminals:"
-        ws['A6'].font = Font(bold=True)
-        ws['B6'] = len(self.terminals) - 1  # Exclude $
-        
-        ws['A7'] = "Number of Conflicts:"
-        ws['A7'].font = Font(bold=True)
-        ws['B7'] = len(self.conflicts)
+        ws.append([
+            _styled_cell(ws, "Is LL(1)?", font=styles['heading']),
+            _styled_cell(ws, "YES ✓" if is_ll1 else "NO ✗",
+                         font=styles['heading_green' if is_ll1 else 'heading_red']),
+        ])
+        ws.append([])
+        
+        ws.append([_styled_cell(ws, "Number of Non-Terminals:", font=styles['bold']), len(self.non_terminals)])
+        ws.append([_styled_cell(ws, "Number of Terminals:", font=styles['bold']), len(self.terminals) - 1])  # Exclude $
+        ws.append([_styled_cell(ws, "Number of Conflicts:", font=styles['bold']), len(self.conflicts)])
+        ws.append([])
         
         if self.conflicts:
-            ws['A9'] = "Conflicts Details:"
-            ws['A9'].font = Font(bold=True, size=12, color="FF0000")
-            ws.merge_cells('A9:E9')
+            ws.append([_styled_cell(ws, "Conflicts Details:", font=styles['subheading_red'])])
+            ws.merged_cells.add('A9:E9')
+            ws.append([])
             
-            ws['A11'] = "Non-Terminal"
-            ws['B11'] = "Terminal"
-            ws['C11'] = "Conflict Type"
-            ws['D11'] = "Production 1"
-            ws['E11'] = "Production 2"
+            ws.append([
+                _styled_cell(ws, header, font=styles['bold_small'], fill=styles['fill_gold'],
+                             alignment=styles['center_both'])
+                for header in ("Non-Terminal", "Terminal", "Conflict Type", "Production 1", "Production 2")
+            ])
             
-            for cell in ['A11', 'B11', 'C11', 'D11', 'E11']:
-                ws[cell].font = Font(bold=True, size=11)
-                ws[cell].fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-                ws[cell].alignment = Alignment(horizontal='center', vertical='center')
-            
-            row = 12
             for conflict in self.conflicts:
-                ws[f'A{row}'] = conflict['non_terminal']
-                ws[f'B{row}'] = conflict['terminal']
-                ws[f'C{row}'] = conflict['type']
-                ws[f'D{row}'] = conflict['production1']
-                ws[f'E{row}'] = conflict['production2']
-                
-                for col in ['A', 'B', 'C', 'D', 'E']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                
-                row += 1
+                ws.append([
+                    _styled_cell(ws, conflict[key], fill=styles['fill_red_light'])
+                    for key in ('non_terminal', 'terminal', 'type', 'production1', 'production2')
+                ])
         else:
-            ws['A9'] = "✓ No conflicts found - Grammar is LL(1)!"
-            ws['A9'].font = Font(bold=True, size=12, color="008000")
-            ws.merge_cells('A9:D9')
-        
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 25
-        ws.column_dimensions['D'].width = 35
-        ws.column_dimensions['E'].width = 35
+            ws.append([_styled_cell(ws, "✓ No conflicts found - Grammar is LL(1)!", font=styles['subheading_green'])])
+            ws.merged_cells.add('A9:D9')
     
-    def create_grammar_sheet(self, wb):
+    def create_grammar_sheet(self, wb, styles):
         """Create grammar sheet"""
         ws = wb.create_sheet("Grammar")
         
-        ws['A1'] = "Production #"
-        ws['B1'] = "Non-Terminal"
-        ws['C1'] = "Production"
+        ws.column_dimensions['A'].width = 15
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 40
         
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
+        ws.append([
+            _styled_cell(ws, header, font=styles['header'], fill=styles['fill_blue'])
+            for header in ("Production #", "Non-Terminal", "Production")
+        ])
         
-        row = 2
         prod_num = 0
-        
-        for nt in sorted(self.grammar.keys()):
-            for prod in self.grammar[nt]:
-                ws[f'A{row}'] = prod_num
-                ws[f'B{row}'] = nt
-                ws[f'C{row}'] = f"{nt} → {' '.join(prod)}"
-                row += 1
+        for nt in self._sorted_nts:
+            for i in range(len(self.grammar[nt])):
+                ws.append([prod_num, nt, self.format_production(nt, i)])
                 prod_num += 1
-        
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 40
     
-    def create_first_sheet(self, wb):
+    def create_first_sheet(self, wb, styles):
         """Create FIRST sets sheet"""
         ws = wb.create_sheet("FIRST Sets")
         
-        ws['A1'] = "Symbol"
-        ws['B1'] = "FIRST Set"
-        ws['C1'] = "Explanation"
+        ws.column_dimensions['A'].width = 20
+        ws.column_dimensions['B'].width = 40
+        ws.column_dimensions['C'].width = 30
         
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
+        ws.append([
+            _styled_cell(ws, header, font=styles['header'], fill=styles['fill_gold'])
+            for header in ("Symbol", "FIRST Set", "Explanation")
+        ])
         
-        row = 2
-        for A in sorted(self.non_terminals):
-            ws[f'A{row}'] = A
-            first_set = sorted(self.first.get(A, set()))
-            ws[f'B{row}'] = ', '.join(first_set)
+        for A in self._sorted_nts:
+            first_set = self.first.get(A, set())
             
             # Check if nullable
-            if 'ε' in self.first.get(A, set()):
-                ws[f'C{row}'] = "Nullable (can derive ε)"
-                ws[f'C{row}'].font = Font(color="0000FF", italic=True)
+            if 'ε' in first_set:
+                explanation = _styled_cell(ws, "Nullable (can derive ε)", font=styles['note'])
             else:
-                ws[f'C{row}'] = "Not nullable"
+                explanation = "Not nullable"
             
-            row += 1
-        
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 40
-        ws.column_dimensions['C'].width = 30
+            ws.append([A, ', '.join(sorted(first_set)), explanation])
     
-    def create_follow_sheet(self, wb):
+    def create_follow_sheet(self, wb, styles):
         """Create FOLLOW sets sheet"""
         ws = wb.create_sheet("FOLLOW Sets")
         
-        ws['A1'] = "Non-Terminal"
-        ws['B1'] = "FOLLOW Set"
-        ws['C1'] = "Explanation"
+        ws.column_dimensions['A'].width = 20
+        ws.column_dimensions['B'].width = 40
+        ws.column_dimensions['C'].width = 35
         
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
+        ws.append([
+            _styled_cell(ws, header, font=styles['header'], fill=styles['fill_green'])
+            for header in ("Non-Terminal", "FOLLOW Set", "Explanation")
+        ])
         
-        row = 2
-        for A in sorted(self.non_terminals):
-            ws[f'A{row}'] = A
+        for A in self._sorted_nts:
             follow_set = sorted(self.follow.get(A, set()))
-            ws[f'B{row}'] = ', '.join(follow_set)
             
             if A == self.start_symbol:
-                ws[f'C{row}'] = "Start symbol (contains $)"
-                ws[f'C{row}'].font = Font(color="0000FF", italic=True)
+                explanation = _styled_cell(ws, "Start symbol (contains $)", font=styles['note'])
             else:
-                ws[f'C{row}'] = "Computed from grammar rules"
+                explanation = "Computed from grammar rules"
             
-            row += 1
-        
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 40
-        ws.column_dimensions['C'].width = 35
+            ws.append([A, ', '.join(follow_set), explanation])
     
-    def create_parsing_table_sheet(self, wb):
+    def create_parsing_table_sheet(self, wb, styles):
         """Create LL(1) parsing table sheet"""
         ws = wb.create_sheet("Parsing Table")
         
-        terminals_sorted = sorted(self.terminals)
+        terminals_sorted = self._term_names[1:]
+        n_cols = len(self.term_id)
+        
+        ws.column_dimensions['A'].width = 20
+        for col_idx in range(2, len(terminals_sorted) + 2):
+            ws.column_dimensions[get_column_letter(col_idx)].width = 25
         
-        ws['A1'] = "Non-Terminal"
-        for col_idx, terminal in enumerate(terminals_sorted, start=2):
-            ws.cell(1, col_idx, terminal)
+        ws.append([
+            _styled_cell(ws, header, font=styles['header_small'], fill=styles['fill_blue'],
+                         alignment=styles['center_both'])
+            for header in ["Non-Terminal", *terminals_sorted]
+        ])
         
-        for col_idx in range(1, len(terminals_sorted) + 2):
-            cell = ws.cell(1, col_idx)
-            cell.font = Font(bold=True, size=11)
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.font = Font(bold=True, size=11, color="FFFFFF")
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+        # write-only rows are written out as they are appended, so one "-"
+        # cell can stand in for every empty entry
+        empty = _styled_cell(ws, "-", alignment=styles['center'])
         
-        row = 2
-        for nt in sorted(self.non_terminals):
-            ws.cell(row, 1, nt)
-            ws.cell(row, 1).font = Font(bold=True)
+        for nt, nt_row in self.nt_id.items():
+            base = nt_row * n_cols
+            row = [_styled_cell(ws, nt, font=styles['bold'])] + [empty] * (n_cols - 1)
             
-            for col_idx, terminal in enumerate(terminals_sorted, start=2):
-                if terminal in self.parsing_table[nt]:
-                    entry = self.parsing_table[nt][terminal]
-                    ws.cell(row, col_idx, entry)
-                    ws.cell(row, col_idx).alignment = Alignment(wrap_text=True, vertical='top')
-                    
+            # Only the populated entries need a cell of their own; column
+            # term_id[terminal] lands under the terminal's header
+            for terminal, entry in self.parsing_table[nt].items():
+                col = self.term_id[terminal]
+                if self.table[base + col] == _CONFLICT:
                     # Highlight conflicts
-                    if '/' in entry:
-                        ws.cell(row, col_idx).fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-                        ws.cell(row, col_idx).font = Font(color="FFFFFF", bold=True)
+                    row[col] = _styled_cell(ws, entry, font=styles['white_bold'], fill=styles['fill_red'],
+                                            alignment=styles['wrap'])
                 else:
-                    ws.cell(row, col_idx, "-")
-                    ws.cell(row, col_idx).alignment = Alignment(horizontal='center')
+                    row[col] = _styled_cell(ws, entry, alignment=styles['wrap'])
             
-            row += 1
-        
-        ws.column_dimensions['A'].width = 20
-        for col_idx in range(2, len(terminals_sorted) + 2):
-            ws.column_dimensions[get_column_letter(col_idx)].width = 25
+            ws.append(row)
     
-    def create_conditions_sheet(self, wb):
+    def create_conditions_sheet(self, wb, styles):
         """Create LL(1) conditions check sheet"""
         ws = wb.create_sheet("LL(1) Conditions")
         
-        ws['A1'] = "LL(1) Conditions Verification"
-        ws['A1'].font = Font(bold=True, size=14)
-        ws.merge_cells('A1:E1')
+        ws.column_dimensions['A'].width = 25
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 30
+        ws.column_dimensions['D'].width = 30
+        ws.column_dimensions['E'].width = 20
         
-        ws['A3'] = "For a grammar to be LL(1), for each non-terminal A with productions A → α₁ | α₂ | ... | αₙ:"
-        ws.merge_cells('A3:E3')
-        ws['A3'].alignment = Alignment(wrap_text=True)
+        ws.append([_styled_cell(ws, "LL(1) Conditions Verification", font=styles['heading'])])
+        ws.merged_cells.add('A1:E1')
+        ws.append([])
         
-        ws['A4'] = "1. FIRST(αᵢ) ∩ FIRST(αⱼ) = ∅ for all i ≠ j"
-        ws['A5'] = "2. At most one αᵢ can derive ε"
-        ws['A6'] = "3. If αᵢ ⇒* ε, then FIRST(αⱼ) ∩ FOLLOW(A) = ∅ for all i ≠ j"
+        ws.append([_styled_cell(ws, "For a grammar to be LL(1), for each non-terminal A with productions A → α₁ | α₂ | ... | αₙ:",
+                                alignment=styles['wrap_text'])])
+        ws.merged_cells.add('A3:E3')
         
-        ws['A8'] = "Condition"
-        ws['B8'] = "Non-Terminal"
-        ws['C8'] = "Production 1"
-        ws['D8'] = "Production 2"
-        ws['E8'] = "Conflict Symbols"
+        ws.append(["1. FIRST(αᵢ) ∩ FIRST(αⱼ) = ∅ for all i ≠ j"])
+        ws.append(["2. At most one αᵢ can derive ε"])
+        ws.append(["3. If αᵢ ⇒* ε, then FIRST(αⱼ) ∩ FOLLOW(A) = ∅ for all i ≠ j"])
+        ws.append([])
         
-        for cell in ['A8', 'B8', 'C8', 'D8', 'E8']:
-            ws[cell].font = Font(bold=True, size=11)
-            ws[cell].fill = PatternFill(start_color="5B9BD5", end_color="5B9BD5", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=11, color="FFFFFF")
-            ws[cell].alignment = Alignment(horizontal='center', vertical='center')
+        ws.append([
+            _styled_cell(ws, header, font=styles['header_small'], fill=styles['fill_sky'],
+                         alignment=styles['center_both'])
+            for header in ("Condition", "Non-Terminal", "Production 1", "Production 2", "Conflict Symbols")
+        ])
         
         violations = self.check_ll1_conditions()
         
         if not violations:
-            ws['A10'] = "✓ All LL(1) conditions satisfied!"
-            ws['A10'].font = Font(bold=True, size=12, color="008000")
-            ws.merge_cells('A10:E10')
+            ws.append([])
+            ws.append([_styled_cell(ws, "✓ All LL(1) conditions satisfied!", font=styles['subheading_green'])])
+            ws.merged_cells.add('A10:E10')
         else:
-            row = 9
             for violation in violations:
-                ws[f'A{row}'] = violation['condition']
-                ws[f'B{row}'] = violation['non_terminal']
-                ws[f'C{row}'] = violation['production1']
-                ws[f'D{row}'] = violation['production2']
-                ws[f'E{row}'] = ', '.join(sorted(violation['intersection'])) if violation['intersection'] else 'N/A'
-                
-                for col in ['A', 'B', 'C', 'D', 'E']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                    ws[f'{col}{row}'].alignment = Alignment(wrap_text=True, vertical='top')
-                
-                row += 1
-        
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 30
-        ws.column_dimensions['D'].width = 30
-        ws.column_dimensions['E'].width = 20
+                values = (
+                    violation['condition'],
+                    violation['non_terminal'],
+                    violation['production1'],
+                    violation['production2'],
+                    ', '.join(sorted(violation['intersection'])) if violation['intersection'] else 'N/A',
+                )
+                ws.append([
+                    _styled_cell(ws, value, fill=styles['fill_red_light'], alignment=styles['wrap'])
+                    for value in values
+                ])
 
 
 def main():
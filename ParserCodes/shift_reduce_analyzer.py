@@ -4,53 +4,144 @@ Detects shift-reduce and reduce-reduce conflicts in grammars
 Uses LR(0) automaton to identify potential parsing conflicts
 """
 
+import re
+from array import array
 from collections import defaultdict, deque
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 
+# A quoted terminal runs to the closing quote (or end of line); anything else
+# is a run of characters up to whitespace or a quote
+_TOKEN_RE = re.compile(r"'[^']*'?|[^\s']+")
+
+
+def _excel_styles():
+    """Create the fonts, fills and alignments shared by the analysis sheets"""
+    def solid(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+    
+    return {
+        'title': Font(bold=True, size=16),
+        'heading': Font(bold=True, size=14),
+        'heading_green': Font(bold=True, size=14, color="008000"),
+        'heading_red': Font(bold=True, size=14, color="FF0000"),
+        'subheading_green': Font(bold=True, size=12, color="008000"),
+        'subheading_red': Font(bold=True, size=12, color="FF0000"),
+        'header': Font(bold=True, size=12, color="FFFFFF"),
+        'header_small': Font(bold=True, size=11, color="FFFFFF"),
+        'bold_small': Font(bold=True, size=11),
+        'bold': Font(bold=True),
+        'bold_green': Font(bold=True, color="008000"),
+        'bold_red': Font(bold=True, color="FF0000"),
+        'white_bold': Font(bold=True, color="FFFFFF"),
+        'green': Font(color="008000"),
+        'red': Font(color="FF0000"),
+        'message_green': Font(size=11, color="008000"),
+        'message_red': Font(size=11, color="FF0000"),
+        'fill_blue': solid("4472C4"),
+        'fill_yellow': solid("FFE699"),
+        'fill_coral': solid("FF6B6B"),
+        'fill_dark_red': solid("C00000"),
+        'fill_red': solid("FF0000"),
+        'fill_red_light': solid("FFE6E6"),
+        'fill_pink': solid("FFD9D9"),
+        'fill_sky': solid("5B9BD5"),
+        'fill_gold': solid("FFC000"),
+        'fill_cream': solid("FFF2CC"),
+        'fill_orange': solid("ED7D31"),
+        'center_both': Alignment(horizontal='center', vertical='center'),
+        'wrap': Alignment(wrap_text=True, vertical='top'),
+        'wrap_center': Alignment(wrap_text=True, vertical='center'),
+    }
+
+
+# openpyxl style objects are immutable, so one palette serves every workbook
+_STYLES = _excel_styles()
+
+
+def _styled_cell(ws, value, font=None, fill=None, alignment=None):
+    """Create a cell carrying the given styles, ready for ws.append"""
+    cell = WriteOnlyCell(ws, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
 class LR0Item:
     """Represents an LR(0) item: [A → α·β]"""
+    __slots__ = ('lhs', 'rhs', 'dot_pos', 'next_sym', 'is_complete', '_hash', '_repr', 'id')
+    
     def __init__(self, lhs, rhs, dot_pos):
         self.lhs = lhs
-        self.rhs = rhs
+        self.rhs = tuple(rhs)
         self.dot_pos = dot_pos
+        # Symbol after the dot, or None once the item is complete
+        self.next_sym = self.rhs[dot_pos] if dot_pos < len(self.rhs) else None
+        self.is_complete = self.next_sym is None
+        self._hash = hash((lhs, self.rhs, dot_pos))
+        self._repr = None
+        # Unique within the item table it was interned in; set by make()
+        self.id = None
+    
+    @classmethod
+    def make(cls, table, lhs, rhs, dot_pos):
+        """Return the item for [lhs → rhs] with the dot at dot_pos from table"""
+        # table maps (lhs, rhs tuple, dot position) to the items created so far
+        key = (lhs, rhs, dot_pos)
+        item = table.get(key)
+        if item is None:
+            item = cls(lhs, rhs, dot_pos)
+            item.id = len(table)
+            table[key] = item
+        return item
     
     def __eq__(self, other):
+        if self is other:
+            return True
         return (self.lhs == other.lhs and 
                 self.rhs == other.rhs and 
                 self.dot_pos == other.dot_pos)
     
     def __hash__(self):
-        return hash((self.lhs, tuple(self.rhs), self.dot_pos))
+        return self._hash
     
     def __repr__(self):
-        rhs_with_dot = self.rhs[:self.dot_pos] + ['·'] + self.rhs[self.dot_pos:]
-        return f"[{self.lhs} → {' '.join(rhs_with_dot)}]"
-    
-    def is_complete(self):
-        return self.dot_pos >= len(self.rhs)
-    
-    def next_symbol(self):
-        if self.is_complete():
-            return None
-        return self.rhs[self.dot_pos]
-    
-    def advance(self):
-        return LR0Item(self.lhs, self.rhs, self.dot_pos + 1)
+        # Items are immutable and interned, so each one is formatted once
+        if self._repr is None:
+            rhs_with_dot = self.rhs[:self.dot_pos] + ('·',) + self.rhs[self.dot_pos:]
+            self._repr = f"[{self.lhs} → {' '.join(rhs_with_dot)}]"
+        return self._repr
+    
+    def advance(self, table):
+        return LR0Item.make(table, self.lhs, self.rhs, self.dot_pos + 1)
 
 
 class LR0State:
     """Represents a state in LR(0) automaton"""
+    __slots__ = ('id', 'items', '_hash', 'shift_by_sym', 'reduce_items', 'sorted_items_text')
+    
     def __init__(self, state_id, items):
         self.id = state_id
+        # A no-op when items is already a frozenset, as closure() returns
         self.items = frozenset(items)
+        self._hash = hash(self.items)
+        # Filled in by ShiftReduceAnalyzer.partition_state
+        self.shift_by_sym = {}
+        self.reduce_items = []
+        # Filled in by ShiftReduceAnalyzer.build_automaton for the sheets
+        self.sorted_items_text = None
     
     def __eq__(self, other):
         return self.items == other.items
     
     def __hash__(self):
-        return hash(self.items)
+        return self._hash
     
     def __repr__(self):
         return f"State {self.id}:\n" + "\n".join(f"  {item}" for item in self.items)
@@ -64,13 +155,23 @@ class ShiftReduceAnalyzer:
         self.start_symbol = None
         self.augmented_start = None
         
+        # Interned LR(0) items of this grammar, see LR0Item.make
+        self._items = {}
         self.states = []
+        # Sorted tuple of item ids -> state, see state_key
         self.state_map = {}
-        self.transitions = {}
+        # Flat goto table: goto_tbl[state_id * len(_id_sym) + sym_id] = next
+        # state id, or -1 when there is no transition
+        self.goto_tbl = array('i')
+        self.num_transitions = 0
+        self._closure_cache = {}
         
         self.shift_reduce_conflicts = []
         self.reduce_reduce_conflicts = []
         self.conflict_states = set()
+        # Conflicts grouped by state id, filled in by analyze_conflicts
+        self._sr_by_state = defaultdict(list)
+        self._rr_by_state = defaultdict(list)
         
         self.parse_grammar(grammar_text)
         self.augment_grammar()
@@ -112,155 +213,159 @@ class ShiftReduceAnalyzer:
                         self.terminals.add(symbol)
         
         self.terminals.add('$')
+        # Symbol sets are fixed from here on (augment_grammar freezes the
+        # non-terminals once the augmented start is in)
+        self.terminals = frozenset(self.terminals)
+        
+        # Symbol ids in sorted order, so walking goto_tbl row by row visits
+        # transitions sorted by (state, symbol)
+        self._id_sym = sorted(self.terminals | self.non_terminals)
+        self._sym_id = {sym: sym_id for sym_id, sym in enumerate(self._id_sym)}
     
     def parse_production(self, rhs):
         """Parse a production right-hand side into symbols"""
-        symbols = []
-        i = 0
-        while i < len(rhs):
-            if rhs[i] == "'":
-                j = i + 1
-                while j < len(rhs) and rhs[j] != "'":
-                    j += 1
-                symbols.append(rhs[i:j+1])
-                i = j + 1
-            elif rhs[i].isspace():
-                i += 1
-            else:
-                j = i
-                while j < len(rhs) and not rhs[j].isspace() and rhs[j] != "'":
-                    j += 1
-                symbol = rhs[i:j]
-                if symbol:
-                    symbols.append(symbol)
-                i = j
-        
-        return symbols
+        return tuple(_TOKEN_RE.findall(rhs))
     
     def augment_grammar(self):
         """Augment grammar with SBar → S"""
         self.augmented_start = self.start_symbol + "Bar"
-        self.grammar[self.augmented_start] = [[self.start_symbol]]
-        self.non_terminals.add(self.augmented_start)
+        self.grammar[self.augmented_start] = [(self.start_symbol,)]
+        self.non_terminals = frozenset(self.non_terminals | {self.augmented_start})
+        self._prods_by_nt = {nt: tuple(prods) for nt, prods in self.grammar.items()}
+        
+        # Production numbers: the augmented production counts from 0, and
+        # the remaining productions count from 0 again in sorted LHS order
+        self._prod_num = {}
+        for prod_num, prod in enumerate(self.grammar[self.augmented_start]):
+            self._prod_num.setdefault((self.augmented_start, prod), prod_num)
+        prod_num = 0
+        for nt in sorted(self.grammar.keys()):
+            if nt == self.augmented_start:
+                continue
+            for prod in self.grammar[nt]:
+                self._prod_num.setdefault((nt, prod), prod_num)
+                prod_num += 1
     
     def closure(self, items):
         """Compute closure of a set of LR(0) items"""
         closure_set = set(items)
-        changed = True
+        work = deque(closure_set)
         
-        while changed:
-            changed = False
-            new_items = set()
-            
-            for item in closure_set:
-                next_sym = item.next_symbol()
-                if next_sym and next_sym in self.non_terminals:
-                    # Add items for all productions of next_sym
-                    for production in self.grammar.get(next_sym, []):
-                        new_item = LR0Item(next_sym, production, 0)
-                        if new_item not in closure_set:
-                            new_items.add(new_item)
-                            changed = True
-            
-            closure_set.update(new_items)
+        while work:
+            item = work.popleft()
+            next_sym = item.next_sym
+            if next_sym in self.non_terminals:
+                # Add items for all productions of next_sym
+                for production in self._prods_by_nt[next_sym]:
+                    new_item = LR0Item.make(self._items, next_sym, production, 0)
+                    if new_item not in closure_set:
+                        closure_set.add(new_item)
+                        work.append(new_item)
         
-        return closure_set
-    
-    def goto(self, items, symbol):
-        """Compute GOTO(items, symbol) for LR(0)"""
-        moved_items = set()
-        
-        for item in items:
-            if item.next_symbol() == symbol:
-                moved_items.add(item.advance())
-        
-        if not moved_items:
-            return None
-        
-        return self.closure(moved_items)
+        return frozenset(closure_set)
     
     def build_automaton(self):
         """Build LR(0) automaton"""
         print("\n=== BUILDING LR(0) AUTOMATON ===\n")
         
+        nsyms = len(self._id_sym)
+        self._empty_goto_row = array('i', [-1]) * nsyms
+        
         # Create initial item
-        initial_item = LR0Item(self.augmented_start, 
-                              self.grammar[self.augmented_start][0], 
-                              0)
+        initial_item = LR0Item.make(self._items, self.augmented_start, 
+                                    self.grammar[self.augmented_start][0], 
+                                    0)
         initial_items = self.closure({initial_item})
-        initial_items_frozen = frozenset(initial_items)
         
         initial_state = LR0State(0, initial_items)
-        self.states.append(initial_state)
-        self.state_map[initial_items_frozen] = initial_state
+        self.add_state(initial_state)
+        self.state_map[self.state_key(initial_items)] = initial_state
         
         queue = deque([initial_state])
         
         while queue:
             current_state = queue.popleft()
             
-            # Find all symbols that can be shifted
-            symbols_to_process = set()
+            # Advance every item over its next symbol in one pass, giving
+            # the GOTO kernel for each symbol that can be shifted
+            kernels = defaultdict(list)
             for item in current_state.items:
-                next_sym = item.next_symbol()
+                next_sym = item.next_sym
                 if next_sym:
-                    symbols_to_process.add(next_sym)
+                    kernels[next_sym].append(item.advance(self._items))
             
-            for symbol in symbols_to_process:
-                goto_items = self.goto(current_state.items, symbol)
+            for symbol, moved_items in kernels.items():
+                kernel = frozenset(moved_items)
+                
+                # The same kernel is usually reached from several states
+                goto_items = self._closure_cache.get(kernel)
+                if goto_items is None:
+                    goto_items = self._closure_cache[kernel] = self.closure(kernel)
+                
+                key = self.state_key(goto_items)
+                next_state = self.state_map.get(key)
+                if next_state is None:
+                    next_state = LR0State(len(self.states), goto_items)
+                    self.add_state(next_state)
+                    self.state_map[key] = next_state
+                    queue.append(next_state)
                 
-                if goto_items:
-                    goto_items_frozen = frozenset(goto_items)
-                    
-                    if goto_items_frozen in self.state_map:
-                        next_state = self.state_map[goto_items_frozen]
-                    else:
-                        next_state = LR0State(len(self.states), goto_items)
-                        self.states.append(next_state)
-                        self.state_map[goto_items_frozen] = next_state
-                        queue.append(next_state)
-                    
-                    self.transitions[(current_state.id, symbol)] = next_state.id
+                self.goto_tbl[current_state.id * nsyms + self._sym_id[symbol]] = next_state.id
+                self.num_transitions += 1
+        
+        for state in self.states:
+            state.sorted_items_text = "\n".join(str(item) for item in sorted(state.items, key=str))
         
         print(f"Created {len(self.states)} states")
-        print(f"Created {len(self.transitions)} transitions")
+        print(f"Created {self.num_transitions} transitions")
+    
+    def state_key(self, items):
+        """Canonical state_map key for a closed item set"""
+        return tuple(sorted(item.id for item in items))
+    
+    def add_state(self, state):
+        """Register a new state and give it an empty row in the goto table"""
+        self.partition_state(state)
+        self.states.append(state)
+        self.goto_tbl.extend(self._empty_goto_row)
+    
+    @property
+    def transitions(self):
+        """(state_id, symbol) -> state_id view of the goto table"""
+        nsyms = len(self._id_sym)
+        return {(pos // nsyms, self._id_sym[pos % nsyms]): to_state
+                for pos, to_state in enumerate(self.goto_tbl) if to_state >= 0}
+    
+    def partition_state(self, state):
+        """Split a state's items into a shift item per terminal and the reductions"""
+        for item in state.items:
+            if item.is_complete:
+                # Skip augmented start production
+                if item.lhs != self.augmented_start:
+                    state.reduce_items.append(item)
+            elif item.next_sym in self.terminals:
+                # The first shift item on each symbol is the one reported
+                state.shift_by_sym.setdefault(item.next_sym, item)
     
     def analyze_conflicts(self):
         """Analyze states for shift-reduce and reduce-reduce conflicts"""
         print("\n=== ANALYZING SHIFT-REDUCE CONFLICTS ===\n")
         
         for state in self.states:
-            # Separate shift items and reduce items
-            shift_items = []
-            reduce_items = []
-            
-            for item in state.items:
-                if item.is_complete():
-                    # Skip augmented start production
-                    if item.lhs != self.augmented_start:
-                        reduce_items.append(item)
-                else:
-                    next_sym = item.next_symbol()
-                    if next_sym in self.terminals:
-                        shift_items.append(item)
+            shift_by_sym = state.shift_by_sym
+            reduce_items = state.reduce_items
             
             # Check for shift-reduce conflicts
-            if shift_items and reduce_items:
+            if shift_by_sym and reduce_items:
                 self.conflict_states.add(state.id)
                 
-                # Get shift symbols
-                shift_symbols = set()
-                for item in shift_items:
-                    shift_symbols.add(item.next_symbol())
-                
                 for reduce_item in reduce_items:
-                    for shift_symbol in shift_symbols:
-                        prod_num = self.get_production_number(reduce_item.lhs, reduce_item.rhs)
-                        
+                    prod_num = self.get_production_number(reduce_item.lhs, reduce_item.rhs)
+                    for shift_symbol, shift_item in shift_by_sym.items():
                         self.shift_reduce_conflicts.append({
                             'state': state.id,
                             'symbol': shift_symbol,
-                            'shift_item': str([item for item in shift_items if item.next_symbol() == shift_symbol][0]),
+                            'shift_item': str(shift_item),
                             'reduce_item': str(reduce_item),
                             'production': prod_num
                         })
@@ -282,6 +387,11 @@ class ShiftReduceAnalyzer:
                             'production2': prod_num2
                         })
         
+        for conflict in self.shift_reduce_conflicts:
+            self._sr_by_state[conflict['state']].append(conflict)
+        for conflict in self.reduce_reduce_conflicts:
+            self._rr_by_state[conflict['state']].append(conflict)
+        
         total_conflicts = len(self.shift_reduce_conflicts) + len(self.reduce_reduce_conflicts)
         
         print(f"Found {len(self.shift_reduce_conflicts)} shift-reduce conflict(s)")
@@ -296,24 +406,7 @@ class ShiftReduceAnalyzer:
     
     def get_production_number(self, lhs, rhs):
         """Get production number for A → α"""
-        prod_num = 0
-        
-        # First, check augmented production (always production 0)
-        if lhs == self.augmented_start:
-            for prod in self.grammar[self.augmented_start]:
-                if prod == rhs:
-                    return prod_num
-                prod_num += 1
-        
-        # Then number the rest in order (excluding augmented start)
-        for nt in sorted(self.grammar.keys()):
-            if nt == self.augmented_start:
-                continue
-            for prod in self.grammar[nt]:
-                if nt == lhs and prod == rhs:
-                    return prod_num
-                prod_num += 1
-        return -1
+        return self._prod_num.get((lhs, tuple(rhs)), -1)
     
     def has_conflicts(self):
         """Check if grammar has any conflicts"""
@@ -321,103 +414,89 @@ class ShiftReduceAnalyzer:
     
     def generate_excel(self, filename='shift_reduce_analysis.xlsx'):
         """Generate Excel file with complete analysis"""
-        wb = openpyxl.Workbook()
-        wb.remove(wb.active)
-        
-        self.create_result_sheet(wb)
-        self.create_grammar_sheet(wb)
-        self.create_shift_reduce_conflicts_sheet(wb)
-        self.create_reduce_reduce_conflicts_sheet(wb)
-        self.create_states_sheet(wb)
-        self.create_conflict_states_sheet(wb)
-        self.create_transitions_sheet(wb)
+        # Write-only workbooks stream each row out as it is appended instead
+        # of keeping every cell in memory until save
+        wb = openpyxl.Workbook(write_only=True)
+        styles = _STYLES
+        
+        self.create_result_sheet(wb, styles)
+        self.create_grammar_sheet(wb, styles)
+        self.create_shift_reduce_conflicts_sheet(wb, styles)
+        self.create_reduce_reduce_conflicts_sheet(wb, styles)
+        self.create_states_sheet(wb, styles)
+        self.create_conflict_states_sheet(wb, styles)
+        self.create_transitions_sheet(wb, styles)
         
         wb.save(filename)
         print(f"\n✅ Excel file created: {filename}")
     
-    def create_result_sheet(self, wb):
+    def create_result_sheet(self, wb, styles):
         """Create result sheet"""
         ws = wb.create_sheet("Result", 0)
         
-        ws['A1'] = "Shift-Reduce Conflict Analysis Result"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws.merge_cells('A1:D1')
+        ws.column_dimensions['A'].width = 30
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 20
+        ws.column_dimensions['D'].width = 20
         
-        ws['A3'] = "Conflict-Free?"
-        ws['A3'].font = Font(bold=True, size=14)
+        ws.append([_styled_cell(ws, "Shift-Reduce Conflict Analysis Result", font=styles['title'])])
+        ws.merged_cells.add('A1:D1')
+        ws.append([])
         
         is_conflict_free = not self.has_conflicts()
-        ws['B3'] = "YES ✓" if is_conflict_free else "NO ✗"
-        ws['B3'].font = Font(bold=True, size=14, color="008000" if is_conflict_free else "FF0000")
-        
-        ws['A5'] = "Number of States:"
-        ws['A5'].font = Font(bold=True)
-        ws['B5'] = len(self.states)
-        
-        ws['A6'] = "States with Conflicts:"
-        ws['A6'].font = Font(bold=True)
-        ws['B6'] = len(self.conflict_states)
-        ws['B6'].font = Font(color="FF0000" if len(self.conflict_states) > 0 else "008000")
-        
-        ws['A8'] = "Shift-Reduce Conflicts:"
-        ws['A8'].font = Font(bold=True)
-        ws['B8'] = len(self.shift_reduce_conflicts)
-        ws['B8'].font = Font(color="FF0000" if len(self.shift_reduce_conflicts) > 0 else "008000")
-        
-        ws['A9'] = "Reduce-Reduce Conflicts:"
-        ws['A9'].font = Font(bold=True)
-        ws['B9'] = len(self.reduce_reduce_conflicts)
-        ws['B9'].font = Font(color="FF0000" if len(self.reduce_reduce_conflicts) > 0 else "008000")
-        
-        ws['A10'] = "Total Conflicts:"
-        ws['A10'].font = Font(bold=True)
+        ws.append([
+            _styled_cell(ws, "Conflict-Free?", font=styles['heading']),
+            _styled_cell(ws, "YES ✓" if is_conflict_free else "NO ✗",
+                         font=styles['heading_green' if is_conflict_free else 'heading_red']),
+        ])
+        ws.append([])
+        
+        def count_row(label, count, bold=False):
+            """Label plus a count shown red when non-zero and green otherwise"""
+            color = 'red' if count > 0 else 'green'
+            ws.append([
+                _styled_cell(ws, label, font=styles['bold']),
+                _styled_cell(ws, count, font=styles[f'bold_{color}' if bold else color]),
+            ])
+        
+        ws.append([_styled_cell(ws, "Number of States:", font=styles['bold']), len(self.states)])
+        count_row("States with Conflicts:", len(self.conflict_states))
+        ws.append([])
+        
+        count_row("Shift-Reduce Conflicts:", len(self.shift_reduce_conflicts))
+        count_row("Reduce-Reduce Conflicts:", len(self.reduce_reduce_conflicts))
         total_conflicts = len(self.shift_reduce_conflicts) + len(self.reduce_reduce_conflicts)
-        ws['B10'] = total_conflicts
-        ws['B10'].font = Font(bold=True, color="FF0000" if total_conflicts > 0 else "008000")
+        count_row("Total Conflicts:", total_conflicts, bold=True)
+        ws.append([])
         
         if not is_conflict_free:
-            ws['A12'] = "⚠️ Grammar has parsing conflicts!"
-            ws['A12'].font = Font(bold=True, size=12, color="FF0000")
-            ws.merge_cells('A12:D12')
+            ws.append([_styled_cell(ws, "⚠️ Grammar has parsing conflicts!", font=styles['subheading_red'])])
+            ws.merged_cells.add('A12:D12')
             
-            ws['A13'] = "See conflict details in separate sheets."
-            ws['A13'].font = Font(size=11, color="FF0000")
-            ws.merge_cells('A13:D13')
+            ws.append([_styled_cell(ws, "See conflict details in separate sheets.", font=styles['message_red'])])
+            ws.merged_cells.add('A13:D13')
         else:
-            ws['A12'] = "✓ Grammar is conflict-free!"
-            ws['A12'].font = Font(bold=True, size=12, color="008000")
-            ws.merge_cells('A12:D12')
-        
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 20
+            ws.append([_styled_cell(ws, "✓ Grammar is conflict-free!", font=styles['subheading_green'])])
+            ws.merged_cells.add('A12:D12')
     
-    def create_grammar_sheet(self, wb):
+    def create_grammar_sheet(self, wb, styles):
         """Create grammar sheet"""
         ws = wb.create_sheet("Grammar")
         
-        ws['A1'] = "Production #"
-        ws['B1'] = "Non-Terminal"
-        ws['C1'] = "Production"
+        ws.column_dimensions['A'].width = 15
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 40
         
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_blue'])
+                   for title in ["Production #", "Non-Terminal", "Production"]])
         
-        row = 2
         prod_num = 0
         
         # First, add augmented production (production 0)
         for prod in self.grammar[self.augmented_start]:
-            ws[f'A{row}'] = prod_num
-            ws[f'B{row}'] = self.augmented_start
-            ws[f'C{row}'] = f"{self.augmented_start} → {' '.join(prod)}"
-            ws[f'A{row}'].fill = PatternFill(start_color="FFE699", end_color="FFE699", fill_type="solid")
-            ws[f'B{row}'].fill = PatternFill(start_color="FFE699", end_color="FFE699", fill_type="solid")
-            ws[f'C{row}'].fill = PatternFill(start_color="FFE699", end_color="FFE699", fill_type="solid")
-            row += 1
+            ws.append([_styled_cell(ws, value, fill=styles['fill_yellow'])
+                       for value in (prod_num, self.augmented_start,
+                                     f"{self.augmented_start} → {' '.join(prod)}")])
             prod_num += 1
         
         # Then add the rest in sorted order
@@ -425,220 +504,144 @@ class ShiftReduceAnalyzer:
             if nt == self.augmented_start:
                 continue
             for prod in self.grammar[nt]:
-                ws[f'A{row}'] = prod_num
-                ws[f'B{row}'] = nt
-                ws[f'C{row}'] = f"{nt} → {' '.join(prod)}"
-                row += 1
+                ws.append([prod_num, nt, f"{nt} → {' '.join(prod)}"])
                 prod_num += 1
-        
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 40
     
-    def create_shift_reduce_conflicts_sheet(self, wb):
+    def create_shift_reduce_conflicts_sheet(self, wb, styles):
         """Create shift-reduce conflicts sheet"""
         ws = wb.create_sheet("Shift-Reduce Conflicts")
         
-        ws['A1'] = "State"
-        ws['B1'] = "Symbol"
-        ws['C1'] = "Shift Item"
-        ws['D1'] = "Reduce Item"
-        ws['E1'] = "Production #"
-        
-        for cell in ['A1', 'B1', 'C1', 'D1', 'E1']:
-            ws[cell].font = Font(bold=True, size=11)
-            ws[cell].fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=11, color="FFFFFF")
-            ws[cell].alignment = Alignment(horizontal='center', vertical='center')
-        
-        if self.shift_reduce_conflicts:
-            row = 2
-            for conflict in self.shift_reduce_conflicts:
-                ws[f'A{row}'] = conflict['state']
-                ws[f'B{row}'] = conflict['symbol']
-                ws[f'C{row}'] = conflict['shift_item']
-                ws[f'D{row}'] = conflict['reduce_item']
-                ws[f'E{row}'] = conflict['production']
-                
-                for col in ['A', 'B', 'C', 'D', 'E']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                
-                row += 1
-        else:
-            ws['A2'] = "No shift-reduce conflicts found"
-            ws['A2'].font = Font(size=11, color="008000")
-            ws.merge_cells('A2:E2')
-        
         ws.column_dimensions['A'].width = 10
         ws.column_dimensions['B'].width = 15
         ws.column_dimensions['C'].width = 35
         ws.column_dimensions['D'].width = 35
         ws.column_dimensions['E'].width = 15
-    
-    def create_reduce_reduce_conflicts_sheet(self, wb):
-        """Create reduce-reduce conflicts sheet"""
-        ws = wb.create_sheet("Reduce-Reduce Conflicts")
         
-        ws['A1'] = "State"
-        ws['B1'] = "Reduce Item 1"
-        ws['C1'] = "Production #1"
-        ws['D1'] = "Reduce Item 2"
-        ws['E1'] = "Production #2"
+        ws.append([_styled_cell(ws, title, font=styles['header_small'], fill=styles['fill_coral'],
+                                alignment=styles['center_both'])
+                   for title in ["State", "Symbol", "Shift Item", "Reduce Item", "Production #"]])
         
-        for cell in ['A1', 'B1', 'C1', 'D1', 'E1']:
-            ws[cell].font = Font(bold=True, size=11)
-            ws[cell].fill = PatternFill(start_color="C00000", end_color="C00000", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=11, color="FFFFFF")
-            ws[cell].alignment = Alignment(horizontal='center', vertical='center')
-        
-        if self.reduce_reduce_conflicts:
-            row = 2
-            for conflict in self.reduce_reduce_conflicts:
-                ws[f'A{row}'] = conflict['state']
-                ws[f'B{row}'] = conflict['reduce_item1']
-                ws[f'C{row}'] = conflict['production1']
-                ws[f'D{row}'] = conflict['reduce_item2']
-                ws[f'E{row}'] = conflict['production2']
-                
-                for col in ['A', 'B', 'C', 'D', 'E']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFD9D9", end_color="FFD9D9", fill_type="solid")
-                
-                row += 1
+        if self.shift_reduce_conflicts:
+            for conflict in self.shift_reduce_conflicts:
+                ws.append([_styled_cell(ws, value, fill=styles['fill_red_light'])
+                           for value in (conflict['state'], conflict['symbol'], conflict['shift_item'],
+                                         conflict['reduce_item'], conflict['production'])])
         else:
-            ws['A2'] = "No reduce-reduce conflicts found"
-            ws['A2'].font = Font(size=11, color="008000")
-            ws.merge_cells('A2:E2')
+            ws.append([_styled_cell(ws, "No shift-reduce conflicts found", font=styles['message_green'])])
+            ws.merged_cells.add('A2:E2')
+    
+    def create_reduce_reduce_conflicts_sheet(self, wb, styles):
+        """Create reduce-reduce conflicts sheet"""
+        ws = wb.create_sheet("Reduce-Reduce Conflicts")
         
         ws.column_dimensions['A'].width = 10
         ws.column_dimensions['B'].width = 35
         ws.column_dimensions['C'].width = 15
         ws.column_dimensions['D'].width = 35
         ws.column_dimensions['E'].width = 15
+        
+        ws.append([_styled_cell(ws, title, font=styles['header_small'], fill=styles['fill_dark_red'],
+                                alignment=styles['center_both'])
+                   for title in ["State", "Reduce Item 1", "Production #1", "Reduce Item 2", "Production #2"]])
+        
+        if self.reduce_reduce_conflicts:
+            for conflict in self.reduce_reduce_conflicts:
+                ws.append([_styled_cell(ws, value, fill=styles['fill_pink'])
+                           for value in (conflict['state'], conflict['reduce_item1'], conflict['production1'],
+                                         conflict['reduce_item2'], conflict['production2'])])
+        else:
+            ws.append([_styled_cell(ws, "No reduce-reduce conflicts found", font=styles['message_green'])])
+            ws.merged_cells.add('A2:E2')
     
-    def create_states_sheet(self, wb):
+    def create_states_sheet(self, wb, styles):
         """Create states sheet"""
         ws = wb.create_sheet("States")
         
-        ws['A1'] = "State"
-        ws['B1'] = "LR(0) Items"
-        ws['C1'] = "Conflict?"
+        ws.column_dimensions['A'].width = 15
+        ws.column_dimensions['B'].width = 60
+        ws.column_dimensions['C'].width = 12
         
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="5B9BD5", end_color="5B9BD5", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_sky'])
+                   for title in ["State", "LR(0) Items", "Conflict?"]])
         
-        row = 2
-        for state in self.states:
-            ws[f'A{row}'] = f"State {state.id}"
-            ws[f'A{row}'].font = Font(bold=True)
-            
-            items_text = "\n".join(str(item) for item in sorted(state.items, key=str))
-            ws[f'B{row}'] = items_text
-            ws[f'B{row}'].alignment = Alignment(wrap_text=True, vertical='top')
+        # Row heights must be set before their row is streamed
+        for row, state in enumerate(self.states, start=2):
+            items_text = state.sorted_items_text
+            ws.row_dimensions[row].height = 15 * len(state.items)
             
             if state.id in self.conflict_states:
-                ws[f'C{row}'] = "YES"
-                ws[f'C{row}'].fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-                ws[f'C{row}'].font = Font(color="FFFFFF", bold=True)
-                ws[f'A{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                ws[f'B{row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+                ws.append([
+                    _styled_cell(ws, f"State {state.id}", font=styles['bold'], fill=styles['fill_red_light']),
+                    _styled_cell(ws, items_text, fill=styles['fill_red_light'], alignment=styles['wrap']),
+                    _styled_cell(ws, "YES", font=styles['white_bold'], fill=styles['fill_red'],
+                                 alignment=styles['center_both']),
+                ])
             else:
-                ws[f'C{row}'] = "No"
-            
-            ws[f'C{row}'].alignment = Alignment(horizontal='center', vertical='center')
-            
-            ws.row_dimensions[row].height = 15 * len(state.items)
-            
-            row += 1
-        
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 60
-        ws.column_dimensions['C'].width = 12
+                ws.append([
+                    _styled_cell(ws, f"State {state.id}", font=styles['bold']),
+                    _styled_cell(ws, items_text, alignment=styles['wrap']),
+                    _styled_cell(ws, "No", alignment=styles['center_both']),
+                ])
     
-    def create_conflict_states_sheet(self, wb):
+    def create_conflict_states_sheet(self, wb, styles):
         """Create conflict states detail sheet"""
         ws = wb.create_sheet("Conflict States Detail")
         
-        ws['A1'] = "State"
-        ws['B1'] = "Items"
-        ws['C1'] = "Conflict Type"
-        ws['D1'] = "Description"
+        ws.column_dimensions['A'].width = 10
+        ws.column_dimensions['B'].width = 50
+        ws.column_dimensions['C'].width = 20
+        ws.column_dimensions['D'].width = 15
         
-        for cell in ['A1', 'B1', 'C1', 'D1']:
-            ws[cell].font = Font(bold=True, size=11)
-            ws[cell].fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-            ws[cell].alignment = Alignment(horizontal='center', vertical='center')
+        ws.append([_styled_cell(ws, title, font=styles['bold_small'], fill=styles['fill_gold'],
+                                alignment=styles['center_both'])
+                   for title in ["State", "Items", "Conflict Type", "Description"]])
         
         if self.conflict_states:
-            row = 2
-            for state_id in sorted(self.conflict_states):
+            fill = styles['fill_cream']
+            for row, state_id in enumerate(sorted(self.conflict_states), start=2):
                 state = self.states[state_id]
+                items_text = state.sorted_items_text
                 
-                ws[f'A{row}'] = state_id
-                ws[f'A{row}'].font = Font(bold=True)
-                
-                items_text = "\n".join(str(item) for item in sorted(state.items, key=str))
-                ws[f'B{row}'] = items_text
-                ws[f'B{row}'].alignment = Alignment(wrap_text=True, vertical='top')
+                sr_count = len(self._sr_by_state.get(state_id, []))
+                rr_count = len(self._rr_by_state.get(state_id, []))
                 
                 # Determine conflict types in this state
                 conflict_types = []
-                if any(c['state'] == state_id for c in self.shift_reduce_conflicts):
+                if sr_count:
                     conflict_types.append("Shift-Reduce")
-                if any(c['state'] == state_id for c in self.reduce_reduce_conflicts):
+                if rr_count:
                     conflict_types.append("Reduce-Reduce")
                 
-                ws[f'C{row}'] = ", ".join(conflict_types)
-                ws[f'C{row}'].alignment = Alignment(wrap_text=True, vertical='center')
-                
-                # Count conflicts
-                sr_count = sum(1 for c in self.shift_reduce_conflicts if c['state'] == state_id)
-                rr_count = sum(1 for c in self.reduce_reduce_conflicts if c['state'] == state_id)
-                
-                ws[f'D{row}'] = f"SR: {sr_count}, RR: {rr_count}"
-                ws[f'D{row}'].alignment = Alignment(horizontal='center', vertical='center')
-                
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-                
                 ws.row_dimensions[row].height = 15 * len(state.items)
-                
-                row += 1
+                ws.append([
+                    _styled_cell(ws, state_id, font=styles['bold'], fill=fill),
+                    _styled_cell(ws, items_text, fill=fill, alignment=styles['wrap']),
+                    _styled_cell(ws, ", ".join(conflict_types), fill=fill, alignment=styles['wrap_center']),
+                    _styled_cell(ws, f"SR: {sr_count}, RR: {rr_count}", fill=fill,
+                                 alignment=styles['center_both']),
+                ])
         else:
-            ws['A2'] = "No conflict states found"
-            ws['A2'].font = Font(size=11, color="008000")
-            ws.merge_cells('A2:D2')
-        
-        ws.column_dimensions['A'].width = 10
-        ws.column_dimensions['B'].width = 50
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 15
+            ws.append([_styled_cell(ws, "No conflict states found", font=styles['message_green'])])
+            ws.merged_cells.add('A2:D2')
     
-    def create_transitions_sheet(self, wb):
+    def create_transitions_sheet(self, wb, styles):
         """Create transitions sheet"""
         ws = wb.create_sheet("Transitions")
         
-        ws['A1'] = "From State"
-        ws['B1'] = "Symbol"
-        ws['C1'] = "To State"
-        
-        for cell in ['A1', 'B1', 'C1']:
-            ws[cell].font = Font(bold=True, size=12)
-            ws[cell].fill = PatternFill(start_color="ED7D31", end_color="ED7D31", fill_type="solid")
-            ws[cell].font = Font(bold=True, size=12, color="FFFFFF")
-        
-        row = 2
-        for (from_state, symbol), to_state in sorted(self.transitions.items()):
-            ws[f'A{row}'] = from_state
-            ws[f'B{row}'] = symbol
-            ws[f'C{row}'] = to_state
-            row += 1
-        
         ws.column_dimensions['A'].width = 15
         ws.column_dimensions['B'].width = 15
         ws.column_dimensions['C'].width = 15
-
+        
+        ws.append([_styled_cell(ws, title, font=styles['header'], fill=styles['fill_orange'])
+                   for title in ["From State", "Symbol", "To State"]])
+        
+        # Symbol ids follow sorted symbol order, so the row-major walk of the
+        # goto table already lists transitions sorted by (state, symbol)
+        nsyms = len(self._id_sym)
+        for pos, to_state in enumerate(self.goto_tbl):
+            if to_state >= 0:
+                from_state, sym_id = divmod(pos, nsyms)
+                ws.append([from_state, self._id_sym[sym_id], to_state])
 
 def main():
     from grammar import grammar